@@ -1,3 +1,37 @@
-from beam_interactive_unofficial.interactive_client import BeamInteractiveClient
+import sys
+from importlib import import_module
+
 from beam_interactive_unofficial.progress_update import *
 from beam_interactive_unofficial.exceptions import *
+
+# Loaded on first use rather than at import, so that tools which only need
+# progress updates or the codec don't pay for requests and websockets.
+_LAZY = {
+    'BeamInteractiveClient': 'beam_interactive_unofficial.interactive_client',
+    'ReportDiffer': 'beam_interactive_unofficial.report_diff',
+    'TactileChange': 'beam_interactive_unofficial.report_diff',
+    'JoystickChange': 'beam_interactive_unofficial.report_diff',
+    'ScreenChange': 'beam_interactive_unofficial.report_diff',
+}
+
+__all__ = [name for name in globals() if not name.startswith('_') and name not in ('import_module', 'sys')] + list(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    try:
+        imported = import_module(module)
+    except Exception as e:
+        # Raised from here, anything but an ImportError turns into a confusing
+        # "cannot import name" or AttributeError that hides what went wrong
+        raise ImportError("cannot import name {!r} from {!r}: {}".format(name, __name__, e)) from e
+    value = globals()[name] = getattr(imported, name)
+    return value
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ (PEP 562) only exists from 3.7, so import everything up front
+    for _name in _LAZY:
+        __getattr__(_name)
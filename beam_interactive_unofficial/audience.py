@@ -0,0 +1,212 @@
+import collections
+import time
+
+FIELDS = ('connected', 'quorum', 'active')
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class EWMA:
+    """
+    An exponentially weighted moving average over irregularly spaced
+    samples. A sample's weight halves every `half_life` seconds.
+    """
+
+    __slots__ = ('half_life', 'value', '_last')
+
+    def __init__(self, half_life):
+        self.half_life = half_life
+        self.value = None
+        self._last = None
+
+    def add(self, value, now):
+        if self.value is None:
+            self.value = float(value)
+        else:
+            alpha = 1 - 0.5 ** ((now - self._last) / self.half_life)
+            self.value += alpha * (value - self.value)
+        self._last = now
+
+
+class WindowedPeak:
+    """
+    The largest value seen in the last `window` seconds, kept as one
+    maximum per `resolution` seconds, so memory is bounded by
+    window / resolution however often values come in.
+    """
+
+    def __init__(self, window=60.0, resolution=1.0):
+        self.window = window
+        self.resolution = resolution
+        self._buckets = collections.deque()  # [bucket index, max]
+        self._peak = None
+
+    def add(self, value, now):
+        index = int(now // self.resolution)
+        buckets = self._buckets
+        if buckets and buckets[-1][0] == index:
+            if value > buckets[-1][1]:
+                buckets[-1][1] = value
+        else:
+            buckets.append([index, value])
+
+        oldest = index - int(self.window // self.resolution)
+        expired = False
+        while buckets[0][0] <= oldest:
+            buckets.popleft()
+            expired = True
+        if expired or self._peak is None:
+            self._peak = max(b[1] for b in buckets)
+        elif value > self._peak:
+            self._peak = value
+
+    @property
+    def value(self):
+        return self._peak
+
+
+class DecayingHistogram:
+    """
+    A histogram merged from qgram buckets, with older counts fading out
+    by half every `half_life` seconds. At most `max_buckets` distinct x
+    values are kept; past that, the lightest bucket is folded into its
+    nearest neighbour.
+
+    Quantiles are worked out on every merge and replaced as a whole, so
+    other threads, such as the metrics server's, can read them while
+    the loop thread merges.
+    """
+
+    def __init__(self, half_life=60.0, max_buckets=256):
+        self.half_life = half_life
+        self.max_buckets = max_buckets
+        self._counts = {}  # x -> decayed count
+        self._last = None
+        self._quantiles = dict.fromkeys(QUANTILES)
+
+    def merge(self, buckets, now):
+        """Adds an iterable of (x, y) pairs, decaying what was there before."""
+        counts = self._counts
+        if self._last is not None and counts:
+            decay = 0.5 ** ((now - self._last) / self.half_life)
+            for x in counts:
+                counts[x] *= decay
+        self._last = now
+
+        for x, y in buckets:
+            counts[x] = counts.get(x, 0.0) + y
+        while len(counts) > self.max_buckets:
+            self._fold_lightest()
+        self._quantiles = self._compute_quantiles()
+
+    def _fold_lightest(self):
+        counts = self._counts
+        lightest = min(counts, key=counts.get)
+        weight = counts.pop(lightest)
+        nearest = min(counts, key=lambda x: abs(x - lightest))
+        counts[nearest] += weight
+
+    @property
+    def total(self):
+        return sum(self._counts.values())
+
+    def quantiles(self):
+        """
+        Returns {q: x} for each q in QUANTILES, x being the first bucket
+        whose cumulative count reaches q of the total, as of the last
+        merge. The dict is never changed once returned, so don't change it.
+        """
+        return self._quantiles
+
+    def _compute_quantiles(self):
+        items = sorted(self._counts.items())
+        total = sum(count for _, count in items)
+        result = dict.fromkeys(QUANTILES)
+        if total > 0:
+            targets = iter(QUANTILES)
+            q = next(targets)
+            seen = 0.0
+            for x, count in items:
+                seen += count
+                while q is not None and seen >= q * total:
+                    result[q] = x
+                    q = next(targets, None)
+                if q is None:
+                    break
+            # Rounding can leave the top quantiles unassigned
+            for q in QUANTILES:
+                if result[q] is None:
+                    result[q] = items[-1][0]
+        return result
+
+
+class AudienceAnalytics:
+    """
+    Streaming statistics over Report.users, updated once per report with
+    update(). For each of connected, quorum and active it keeps an EWMA,
+    the all-time peak and the peak over the last `window` seconds. The
+    qgram histograms are merged into a DecayingHistogram for quantiles.
+
+    Everything is bounded in size, and snapshot() only rebuilds its
+    result after an update, so it can be called on every report.
+    """
+
+    def __init__(self, half_life=10.0, window=60.0, histogram_half_life=60.0, max_buckets=256,
+                 clock=time.monotonic):
+        self._clock = clock
+        self.ewma = {field: EWMA(half_life) for field in FIELDS}
+        self.peak = dict.fromkeys(FIELDS, 0)
+        self.window_peak = {field: WindowedPeak(window) for field in FIELDS}
+        self.qgram = DecayingHistogram(histogram_half_life, max_buckets)
+        self.latest = dict.fromkeys(FIELDS, 0)
+        self.reports = 0
+        self._snapshot = None
+
+    def update(self, report, now=None):
+        """Folds a Report's users into the statistics."""
+        if now is None:
+            now = self._clock()
+        users = report.users
+        for field in FIELDS:
+            value = getattr(users, field)
+            self.latest[field] = value
+            self.ewma[field].add(value, now)
+            self.window_peak[field].add(value, now)
+            if value > self.peak[field]:
+                self.peak[field] = value
+        if users.qgram:
+            self.qgram.merge(((bucket.x, bucket.y) for bucket in users.qgram), now)
+        self.reports += 1
+        self._snapshot = None
+
+    def snapshot(self):
+        """
+        Returns {field: {'latest', 'ewma', 'peak', 'window_peak'}} for each
+        field, plus 'qgram' with the merged quantiles and 'reports'. The
+        same dict is returned until the next update, so don't change it.
+        """
+        if self._snapshot is None:
+            snapshot = {
+                field: {
+                    'latest': self.latest[field],
+                    'ewma': self.ewma[field].value,
+                    'peak': self.peak[field],
+                    'window_peak': self.window_peak[field].value,
+                } for field in FIELDS
+            }
+            snapshot['qgram'] = {'p{:g}'.format(q * 100): x for q, x in self.qgram.quantiles().items()}
+            snapshot['reports'] = self.reports
+            self._snapshot = snapshot
+        return self._snapshot
+
+    def register_metrics(self, metrics):
+        """Exposes the EWMAs, peaks and quantiles as gauges on a Metrics registry."""
+        for field in FIELDS:
+            metrics.gauge_function('audience_{}'.format(field), lambda f=field: self.latest[f],
+                                   "Users {} in the last report".format(field))
+            metrics.gauge_function('audience_{}_ewma'.format(field), lambda f=field: self.ewma[f].value or 0,
+                                   "Moving average of users {}".format(field))
+            metrics.gauge_function('audience_{}_peak'.format(field), lambda f=field: self.window_peak[f].value or 0,
+                                   "Peak users {} over the window".format(field))
+        for q in QUANTILES:
+            metrics.gauge_function('audience_qgram', lambda q=q: self.qgram.quantiles()[q] or 0,
+                                   "Quantiles of the merged qgram histogram", quantile=str(q))
@@ -1 +1,37 @@
-from .helpers import start
+import sys
+from importlib import import_module
+
+from . import profiling
+
+# Loaded on first use, so that importing the codec doesn't pull in
+# websockets and everything the connection needs.
+_LAZY = {
+    'start': '.helpers',
+    'open_socket': '.helpers',
+    'LatencyRecorder': '.latency',
+    'Metrics': '.metrics',
+    'MetricsServer': '.metrics',
+    'CaptureWriter': '.capture',
+    'CaptureReader': '.capture',
+    'Watchdog': '.watchdog',
+    'Compression': '.compression',
+    'CompressionStats': '.compression',
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    try:
+        imported = import_module(module, __name__)
+    except Exception as e:
+        raise ImportError("cannot import name {!r} from {!r}: {}".format(name, __name__, e)) from e
+    value = globals()[name] = getattr(imported, name)
+    return value
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ (PEP 562) only exists from 3.7, so import everything up front
+    for _name in _LAZY:
+        __getattr__(_name)
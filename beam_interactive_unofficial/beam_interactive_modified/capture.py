@@ -0,0 +1,222 @@
+"""
+Recording of raw frames to disk, and reading them back.
+
+A capture file starts with MAGIC and is followed by one record per
+frame: a RECORD header (direction, monotonic timestamp, length) and
+then the frame's bytes. Alongside it, `<path>.idx` holds an INDEX entry
+(file offset, timestamp) per frame, so a reader can jump straight to
+the n-th frame or to a point in time. Both files are only ever
+appended to, and index entries are only written once the frames they
+point at have been flushed, so a capture cut short by a crash has at
+worst some unindexed frames at the end.
+"""
+
+import bisect
+import mmap
+import os
+import struct
+import time
+from collections import namedtuple
+
+MAGIC = b'BEAMCAP1'
+RECORD = struct.Struct('<BdI')
+INDEX = struct.Struct('<Qd')
+
+INBOUND, OUTBOUND = 0, 1
+
+Frame = namedtuple('Frame', ['timestamp', 'direction', 'data'])
+
+
+class CaptureWriter():
+    """
+    Appends frames to a capture file through a buffered writer. Pass
+    one as `capture` to start() (or a path to BeamInteractiveClient) to
+    record a connection.
+    """
+
+    clock = staticmethod(time.monotonic)
+
+    def __init__(self, path, buffer_size=1 << 16):
+        self.path = path
+        self._file = open(path, 'ab', buffering=buffer_size)
+        self._index = open(path + '.idx', 'ab')
+        self._buffer_size = buffer_size
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._offset = self._file.tell()
+        # Index entries for frames that may not have reached the file yet
+        self._pending = bytearray()
+
+    def record(self, direction, data):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        timestamp = self.clock()
+        self._file.write(RECORD.pack(direction, timestamp, len(data)))
+        self._file.write(data)
+        self._pending += INDEX.pack(self._offset, timestamp)
+        self._offset += RECORD.size + len(data)
+        if len(self._pending) >= self._buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Flushes the frames, then the index entries that point at them."""
+        self._file.flush()
+        if self._pending:
+            self._index.write(self._pending)
+            self._index.flush()
+            del self._pending[:]
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+            self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _map(path):
+    """Memory-maps a file read-only. Returns None if it is empty."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class CaptureReader():
+    """
+    Reads a capture file through mmap, so only the pages that are
+    actually touched get loaded. Frames can be iterated in order,
+    indexed by position, or looked up by timestamp. Frame data is
+    returned as bytes, or as zero-copy memoryviews with copy=False
+    (which must be released before the reader is closed).
+    """
+
+    def __init__(self, path):
+        self._data = _map(path)
+        if self._data is None or self._data[:len(MAGIC)] != MAGIC:
+            raise ValueError("{} is not a capture file".format(path))
+
+        self._index = None
+        if os.path.exists(path + '.idx'):
+            # An empty index is one with no entries yet, which mmap can't map
+            self._index = _map(path + '.idx') or b''
+        self._view = memoryview(self._data)
+        if self._index is not None:
+            self._indexed = self._count_indexed()
+            # Frames written after the last indexed one, e.g. by a writer that
+            # was never flushed, are found by walking the data file
+            self._unindexed = list(self._offsets(self._indexed_end()))
+
+    def _count_indexed(self):
+        """
+        The number of index entries that point at complete frames. If the
+        capture file was cut short, the last few may point past its end.
+        """
+        n, end = len(self._index) // INDEX.size, len(self._data)
+        while n:
+            offset = INDEX.unpack_from(self._index, (n - 1) * INDEX.size)[0]
+            if offset + RECORD.size <= end and \
+                    offset + RECORD.size + RECORD.unpack_from(self._data, offset)[2] <= end:
+                break
+            n -= 1
+        return n
+
+    def _indexed_end(self):
+        """The offset just past the last indexed frame."""
+        if not self._indexed:
+            return len(MAGIC)
+        offset = INDEX.unpack_from(self._index, (self._indexed - 1) * INDEX.size)[0]
+        return offset + RECORD.size + RECORD.unpack_from(self._data, offset)[2]
+
+    def __len__(self):
+        if self._index is None:
+            return sum(1 for _ in self._offsets())
+        return self._indexed + len(self._unindexed)
+
+    def _offsets(self, offset=len(MAGIC)):
+        """Yields the offset of every frame from the given one, by walking the records."""
+        end = len(self._data)
+        while offset + RECORD.size <= end:
+            length = RECORD.unpack_from(self._data, offset)[2]
+            if offset + RECORD.size + length > end:
+                break  # a partly written last frame
+            yield offset
+            offset += RECORD.size + length
+
+    def _offset(self, n):
+        """The offset of the n-th frame, from the index or the walked tail after it."""
+        if n < self._indexed:
+            return INDEX.unpack_from(self._index, n * INDEX.size)[0]
+        return self._unindexed[n - self._indexed]
+
+    def _frame_at(self, offset, copy=True):
+        direction, timestamp, length = RECORD.unpack_from(self._data, offset)
+        start = offset + RECORD.size
+        data = self._view[start:start + length]
+        return Frame(timestamp, direction, bytes(data) if copy else data)
+
+    def __getitem__(self, n):
+        if self._index is None:
+            raise TypeError("random access needs the capture's index file")
+        if n < 0:
+            n += len(self)
+        if not 0 <= n < len(self):
+            raise IndexError(n)
+        return self._frame_at(self._offset(n))
+
+    def frames(self, start=0, direction=None, copy=True):
+        """
+        Yields frames in order, starting from the start-th one, and
+        optionally only those in one direction (INBOUND or OUTBOUND).
+        """
+        if start and self._index is not None:
+            offsets = (self._offset(n) for n in range(start, len(self)))
+        else:
+            offsets = (o for n, o in enumerate(self._offsets()) if n >= start)
+
+        for offset in offsets:
+            frame = self._frame_at(offset, copy)
+            if direction is None or frame.direction == direction:
+                yield frame
+
+    def __iter__(self):
+        return self.frames()
+
+    def find(self, timestamp):
+        """
+        Returns the position of the first frame at or after timestamp,
+        using a binary search over the index.
+        """
+        if self._index is None:
+            raise TypeError("searching by time needs the capture's index file")
+
+        reader = self
+
+        class _Timestamps():
+            def __len__(self):
+                return len(reader)
+
+            def __getitem__(self, n):
+                if n < reader._indexed:
+                    return INDEX.unpack_from(reader._index, n * INDEX.size)[1]
+                return RECORD.unpack_from(reader._data, reader._offset(n))[1]
+
+        return bisect.bisect_left(_Timestamps(), timestamp)
+
+    def close(self):
+        self._view.release()
+        self._data.close()
+        if isinstance(self._index, mmap.mmap):
+            self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,101 @@
+import time
+
+from websockets.extensions.permessage_deflate import ClientPerMessageDeflateFactory, PerMessageDeflate
+
+
+class Compression():
+    """
+    permessage-deflate settings to negotiate when connecting to the
+    robot. level and mem_level are passed to zlib for what we send;
+    window_bits (9-15) caps the window in both directions, trading
+    ratio for memory. Without context_takeover every message is
+    compressed on its own, which costs ratio but keeps no state
+    between messages.
+    """
+
+    def __init__(self, level=6, window_bits=15, mem_level=8, context_takeover=True):
+        if not 9 <= window_bits <= 15:
+            raise ValueError("window_bits must be between 9 and 15")
+        self.level = level
+        self.window_bits = window_bits
+        self.mem_level = mem_level
+        self.context_takeover = context_takeover
+
+    def factories(self):
+        """Returns the extensions to pass to websockets.connect()."""
+        return [ClientPerMessageDeflateFactory(
+            server_no_context_takeover=not self.context_takeover,
+            client_no_context_takeover=not self.context_takeover,
+            # Only ask the robot for a smaller window; asking for the
+            # default gains nothing and some servers refuse the parameter.
+            server_max_window_bits=self.window_bits if self.window_bits < 15 else None,
+            client_max_window_bits=self.window_bits,
+            compress_settings={'level': self.level, 'memLevel': self.mem_level})]
+
+
+class CompressionStats():
+    """
+    Wraps a negotiated PerMessageDeflate extension, counting raw and
+    on-the-wire bytes in each direction and the CPU time spent
+    compressing and decompressing. Attach one with attach().
+    """
+
+    def __init__(self, extension, metrics):
+        self._extension = extension
+        self.name = extension.name
+        self._raw = {d: metrics.counter('compression_raw_bytes_total', "Bytes before compression", direction=d)
+                     for d in ('in', 'out')}
+        self._wire = {d: metrics.counter('compression_wire_bytes_total', "Bytes after compression", direction=d)
+                      for d in ('in', 'out')}
+        self._cpu = {d: metrics.counter('compression_cpu_seconds_total', "CPU time spent on compression",
+                                        direction=d) for d in ('in', 'out')}
+
+    def encode(self, frame):
+        start = time.thread_time()
+        encoded = self._extension.encode(frame)
+        self._cpu['out'].inc(time.thread_time() - start)
+        if encoded is not frame:
+            self._raw['out'].inc(len(frame.data))
+            self._wire['out'].inc(len(encoded.data))
+        return encoded
+
+    def decode(self, frame, *args, **kwargs):
+        start = time.thread_time()
+        decoded = self._extension.decode(frame, *args, **kwargs)
+        self._cpu['in'].inc(time.thread_time() - start)
+        if decoded is not frame:
+            self._raw['in'].inc(len(decoded.data))
+            self._wire['in'].inc(len(frame.data))
+        return decoded
+
+    def __getattr__(self, name):
+        return getattr(self._extension, name)
+
+    def stats(self):
+        """
+        Returns {'in': {...}, 'out': {...}} with raw_bytes, wire_bytes,
+        ratio (wire / raw, so lower is better) and cpu_seconds.
+        """
+        result = {}
+        for d in ('in', 'out'):
+            raw, wire = self._raw[d].value, self._wire[d].value
+            result[d] = {
+                'raw_bytes': raw,
+                'wire_bytes': wire,
+                'ratio': wire / raw if raw else None,
+                'cpu_seconds': self._cpu[d].value,
+            }
+        return result
+
+
+def attach(socket, metrics):
+    """
+    Swaps the socket's permessage-deflate extension for a counting
+    CompressionStats and returns it, or returns None if the robot
+    didn't agree to compression.
+    """
+    for i, extension in enumerate(socket.extensions):
+        if isinstance(extension, PerMessageDeflate):
+            socket.extensions[i] = stats = CompressionStats(extension, metrics)
+            return stats
+    return None
@@ -1,7 +1,12 @@
 import asyncio
 import collections
+import threading
 from websockets.exceptions import ConnectionClosed
-from .proto import encode, decode
+from .proto import encode, decode, id as identifier
+from .exceptions import DecoderException
+from .metrics import Metrics
+from . import profiling
+from .capture import INBOUND, OUTBOUND
 
 
 states = {'open': 0, 'closing': 1, 'closed': 2}
@@ -28,21 +33,105 @@ class Connection():
     https://github.com/aio-libs/aioredis
     """
 
-    def __init__(self, socket, loop):
+    def __init__(self, socket, loop, latency=None, metrics=None, capture=None):
         self._socket = socket
         self._loop = loop
         self._state = states['open']
 
+        # A CaptureWriter that every frame is recorded to, or None.
+        self.capture = capture
+
+        # CompressionStats if permessage-deflate was negotiated, or None.
+        self.compression = None
+
+        self.metrics = metrics if metrics is not None else Metrics()
+        self._packet_counters = {}
+        self._decode_errors = self.metrics.counter('decode_errors_total', "Frames that could not be decoded")
+        self._unknown_packets = self.metrics.counter('unknown_packets_total', "Frames with an unknown packet ID")
+        self._write_queue_depth = self.metrics.gauge('write_queue_depth', "Packets waiting to be written")
+        self._write_queue_depth.set(0)
+        self.metrics.gauge_function('read_queue_depth', lambda: len(self._read_queue),
+                                    "Packets waiting to be handled")
+
+        # A LatencyRecorder, or None if latency isn't being measured.
+        # Every timing below is skipped when this is None.
+        self.latency = latency
+        self._read_times = collections.deque()
+        self._dispatched_at = None
+
+        # Packets sent from other threads wait here, already encoded, until
+        # the loop drains them. deque appends and pops are atomic, so no
+        # lock is needed, and _wakeup_pending means the loop is only woken
+        # once per batch rather than once per packet.
+        self._outbox = collections.deque()
+        self._wakeup_pending = False
+        self._loop_thread = threading.get_ident()
+        self.metrics.gauge_function('outbox_depth', lambda: len(self._outbox),
+                                    "Packets sent from other threads, waiting for the loop")
+
+        # Loop time of the last frame received, for the liveness Watchdog.
+        self.last_frame_at = loop.time()
+
+        self._close_task = None
         self._read_task = asyncio.Task(self._read_data(), loop=loop)
         self._read_queue = collections.deque()
         self._read_waiter = None
 
+    def _count_packet(self, direction, data):
+        """
+        Bumps the packet and byte counters for a frame. Packet IDs all
+        fit in one varint byte, so the first byte of the frame is its ID.
+        """
+        packet_id = data[0] if data else None
+        counters = self._packet_counters.get((direction, packet_id))
+        if counters is None:
+            name = identifier.get_packet_name(packet_id) or 'unknown'
+            counters = self._packet_counters[(direction, packet_id)] = (
+                self.metrics.counter('packets_{}_total'.format(direction),
+                                     "Packets {}".format('received' if direction == 'in' else 'sent'), packet=name),
+                self.metrics.counter('bytes_{}_total'.format(direction),
+                                     "Bytes {}".format('received' if direction == 'in' else 'sent'), packet=name))
+
+        counters[0].value += 1
+        counters[1].value += len(data)
+
     def _push_packet(self, packet):
         """
         Appends a packet to the internal read queue, or notifies
-        a waiting listener that a packet just came in.
+        a waiting listener that a packet just came in. Frames that
+        can't be decoded are counted and dropped.
+        """
+        if profiling.hooks:
+            packet_type = identifier.get_packet_name(packet[0]) if packet else None
+            tokens = profiling.begin('push_packet', packet_type)
+            try:
+                return self._do_push_packet(packet)
+            finally:
+                profiling.end('push_packet', packet_type, tokens)
+        return self._do_push_packet(packet)
+
+    def _do_push_packet(self, packet):
+        """
+        Underlying implementation of _push_packet.
         """
-        self._read_queue.append((decode(packet), packet))
+        self.last_frame_at = self._loop.time()
+        if self.capture is not None:
+            self.capture.record(INBOUND, packet)
+        if self.latency is not None:
+            received_at = self.latency.clock()
+
+        self._count_packet('in', packet)
+        try:
+            decoded = decode(packet)
+        except DecoderException:
+            self._decode_errors.inc()
+            return
+
+        if decoded is None:
+            self._unknown_packets.inc()
+        if self.latency is not None:
+            self._read_times.append(received_at)
+        self._read_queue.append((decoded, packet))
 
         if self._read_waiter is not None:
             w, self._read_waiter = self._read_waiter, None
@@ -54,11 +143,10 @@ class Connection():
         Reads data from the connection and adds it to _push_packet,
         until the connection is closed or the task in cancelled.
         """
+        self._loop_thread = threading.get_ident()
         while True:
             try:
-                data = yield from asyncio.wait_for(self._socket.recv(), 1)
-            except asyncio.TimeoutError:
-                continue
+                data = yield from self._socket.recv()
             except asyncio.CancelledError:
                 break
             except ConnectionClosed:
@@ -85,7 +173,7 @@ class Connection():
 
         self._read_waiter = asyncio.Future(loop=self._loop)
         yield from self._read_waiter
-        return self.wait_message()
+        return (yield from self.wait_message())
 
     def get_packet(self):
         """
@@ -95,29 +183,135 @@ class Connection():
         if len(self._read_queue) == 0:
             raise NoPacketException()
 
-        return self._read_queue.popleft()
+        packet = self._read_queue.popleft()
+        if self.latency is not None:
+            self._dispatched_at = now = self.latency.clock()
+            self.latency.record('queue', identifier.get_packet_id(packet[0]), now - self._read_times.popleft())
+
+        return packet
+
+    def packet_handled(self, packet):
+        """
+        Marks the handler for the last packet from get_packet() as
+        finished, for latency measurement.
+        """
+        if self.latency is not None and self._dispatched_at is not None:
+            self.latency.record('handler', identifier.get_packet_id(packet[0]),
+                                self.latency.clock() - self._dispatched_at)
+            self._dispatched_at = None
 
     @asyncio.coroutine
     def send_coro(self, packet):
         """
         Sends a packet to the Interactive daemon over the wire.
         """
-        yield from self._socket.send(encode(packet))
+        yield from self._write(encode(packet))
+
+    @asyncio.coroutine
+    def _send_queued(self, packet, queued_at):
+        yield from self._write(encode(packet), True, queued_at)
+
+    def _queued_at(self):
+        """The time to stamp a queued packet with, or None if latency isn't measured."""
+        return self.latency.clock() if self.latency is not None else None
+
+    @asyncio.coroutine
+    def _write(self, data, queued=False, queued_at=None):
+        """
+        Writes an encoded packet to the socket. queued is True for packets
+        that went through the write queue, in which case queued_at is when
+        they were put there, or None if latency wasn't being measured then.
+        """
+        if queued:
+            self._write_queue_depth.value -= 1
+
+        self._count_packet('out', data)
+        if self.capture is not None:
+            self.capture.record(OUTBOUND, data)
+        if self.latency is None:
+            yield from self._socket.send(data)
+            return
+
+        packet_id = data[0]
+        start = self.latency.clock()
+        if queued and queued_at is not None:
+            self.latency.record('send_queue', packet_id, start - queued_at)
+        yield from self._socket.send(data)
+        self.latency.record('write', packet_id, self.latency.clock() - start)
 
     def send(self, packet):
         """
-        Schedules a packet to be sent - for use outside coroutines
+        Schedules a packet to be sent - for use outside coroutines.
+        This may be called from any thread.
+        """
+        if threading.get_ident() != self._loop_thread:
+            return self.send_threadsafe(packet)
+
+        self._write_queue_depth.value += 1
+        self._loop.create_task(self._send_queued(packet, self._queued_at()))
+
+    def send_encoded(self, *frames):
+        """
+        Schedules already encoded packets to be written back to back,
+        in one task. May be called from any thread.
+        """
+        queued_at = self._queued_at()
+        if threading.get_ident() != self._loop_thread:
+            self._outbox.extend((data, queued_at) for data in frames)
+            if not self._wakeup_pending:
+                self._wakeup_pending = True
+                self._loop.call_soon_threadsafe(self._drain_outbox)
+            return
+
+        self._write_queue_depth.value += len(frames)
+        self._loop.create_task(self._write_batch([(data, queued_at) for data in frames]))
+
+    def send_threadsafe(self, packet):
+        """
+        Schedules a packet to be sent from a thread other than the
+        loop's. The packet is encoded on the calling thread, and the
+        loop is woken once for however many packets pile up before
+        it gets round to them.
         """
-        self._loop.create_task(self.send_coro(packet))
+        self._outbox.append((encode(packet), self._queued_at()))
+        if not self._wakeup_pending:
+            self._wakeup_pending = True
+            self._loop.call_soon_threadsafe(self._drain_outbox)
+
+    def _drain_outbox(self):
+        # Clear the flag before draining: anything appended after this
+        # point is either picked up below or schedules another drain.
+        self._wakeup_pending = False
+        outbox, batch = self._outbox, []
+        while outbox:
+            batch.append(outbox.popleft())
+
+        if batch:
+            self._write_queue_depth.value += len(batch)
+            self._loop.create_task(self._write_batch(batch))
+
+    @asyncio.coroutine
+    def _write_batch(self, batch):
+        for data, queued_at in batch:
+            yield from self._write(data, True, queued_at)
 
     def _do_close(self):
         """
         Underlying closer function.
         """
 
-        self._socket.close()
+        closing = self._socket.close()
+        if closing is not None:
+            # websockets' close() is a coroutine - make sure it actually runs
+            self._close_task = asyncio.ensure_future(closing, loop=self._loop)
         self._state = states['closed']
 
+        # wake up anything in wait_message(), which will now return False
+        if self._read_waiter is not None:
+            w, self._read_waiter = self._read_waiter, None
+            if not w.done():
+                w.set_result(None)
+
     def close(self):
         """
         Closes the connection if it is open.
@@ -126,6 +320,17 @@ class Connection():
         if self._state == states['open']:
             self._do_close()
 
+    @asyncio.coroutine
+    def wait_closed(self):
+        """
+        Waits for the read task and the socket's closing handshake to
+        finish, after close() has been called.
+        """
+        self._read_task.cancel()
+        yield from asyncio.gather(self._read_task, loop=self._loop, return_exceptions=True)
+        if self._close_task is not None:
+            yield from asyncio.gather(self._close_task, loop=self._loop, return_exceptions=True)
+
     @property
     def open(self):
         """
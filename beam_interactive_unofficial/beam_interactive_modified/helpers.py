@@ -1,25 +1,53 @@
 import asyncio
 import websockets
 from .connection import Connection
+from .compression import attach
 from .proto import Handshake
 
 
 @asyncio.coroutine
-def start(address, channel, key, loop=None):
+def open_socket(address, loop=None, compression=None):
+    """
+    Opens the websocket to the Tetris robot without handshaking, so
+    nothing is sent, counted or captured yet. Pass it to start() as
+    socket to carry on.
+    """
+
+    if loop is None:
+        loop = asyncio.get_event_loop()
+
+    extensions = compression.factories() if compression is not None else None
+    return (yield from websockets.connect(address+"/robot", loop=loop, compression=None, extensions=extensions))
+
+
+@asyncio.coroutine
+def start(address, channel, key, loop=None, latency=None, metrics=None, capture=None, compression=None,
+          socket=None):
     """Starts a new Interactive client.
 
     Takes the remote address of the Tetris robot, as well as the
     channel number and auth key to use. Additionally, it takes
     a list of handler. This should be a dict of protobuf wire
     IDs to handler functions (from the .proto package).
+
+    Pass a LatencyRecorder as latency to time every packet, and a
+    Metrics registry as metrics to share counters across connections.
+    Pass a CaptureWriter as capture to record every frame to disk.
+    Pass a Compression as compression to negotiate permessage-deflate;
+    the connection's compression attribute then holds its stats.
+    Pass a websocket from open_socket() as socket to handshake on it
+    rather than opening a new one.
     """
 
     if loop is None:
         loop = asyncio.get_event_loop()
 
-    socket = yield from websockets.connect(address+"/robot", loop=loop)
+    if socket is None:
+        socket = yield from open_socket(address, loop, compression)
 
-    conn = Connection(socket, loop)
+    conn = Connection(socket, loop, latency=latency, metrics=metrics, capture=capture)
+    if compression is not None:
+        conn.compression = attach(socket, conn.metrics)
     yield from conn.send_coro(_create_handshake(channel, key))
 
     return conn
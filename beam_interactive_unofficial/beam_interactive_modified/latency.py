@@ -0,0 +1,101 @@
+from time import perf_counter
+
+from .proto import id as identifier
+
+# Bucket i holds latencies below 2**i microseconds, so 27 buckets run from
+# 1us up to about a minute. Anything slower lands in the last one.
+BUCKETS = 27
+BOUNDS_US = [1 << i for i in range(BUCKETS)]
+
+STAGES = ('queue', 'handler', 'send_queue', 'write')
+
+
+class Histogram():
+    """
+    A fixed-bucket latency histogram. Recording is a bit_length() and a
+    list increment, so it is cheap enough to do for every packet.
+    """
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        index = int(seconds * 1000000).bit_length()
+        self.counts[index if index < BUCKETS else BUCKETS - 1] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p):
+        """
+        Returns the upper bound, in seconds, of the bucket holding the
+        p-th percentile (0 <= p <= 100). Returns None if it is empty.
+        """
+        if not self.count:
+            return None
+
+        target = self.count * p / 100
+        seen = 0
+        for bound, n in zip(BOUNDS_US, self.counts):
+            seen += n
+            if seen >= target and n:
+                return bound / 1000000
+        return BOUNDS_US[-1] / 1000000
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'buckets': {bound: n for bound, n in zip(BOUNDS_US, self.counts) if n},
+        }
+
+
+class LatencyRecorder():
+    """
+    Keeps a Histogram per (stage, packet ID). The stages are:
+
+    queue       frame received -> taken off the read queue for dispatch
+    handler     dispatch -> handler finished
+    send_queue  send() called -> write to the socket started
+    write       write to the socket started -> finished
+    """
+
+    clock = staticmethod(perf_counter)
+
+    def __init__(self):
+        self._histograms = {}
+
+    def record(self, stage, packet_id, seconds):
+        key = (stage, packet_id)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram()
+        histogram.record(seconds)
+
+    def histogram(self, stage, packet_id):
+        """Returns the histogram for a stage and packet ID, or None."""
+        return self._histograms.get((stage, packet_id))
+
+    def snapshot(self):
+        """
+        Returns {stage: {packet name: histogram snapshot}}. Latencies
+        are in seconds, bucket bounds in microseconds.
+        """
+        result = {}
+        for (stage, packet_id), histogram in self._histograms.items():
+            name = identifier.get_packet_name(packet_id) or str(packet_id)
+            result.setdefault(stage, {})[name] = histogram.snapshot()
+        return result
+
+    def reset(self):
+        self._histograms.clear()
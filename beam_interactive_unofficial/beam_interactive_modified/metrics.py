@@ -0,0 +1,183 @@
+import threading
+from collections import OrderedDict
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
+
+
+class Counter():
+    """
+    A monotonically increasing value. inc() is a plain attribute add with
+    no locking - counters are only ever bumped from the event loop thread,
+    and readers on other threads just see a slightly stale value.
+    """
+
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, n=1):
+        self.value += n
+
+
+class Gauge():
+    """A value that can go up and down."""
+
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, n=1):
+        self.value += n
+
+    def dec(self, n=1):
+        self.value -= n
+
+
+class _FunctionGauge():
+    """A gauge whose value is computed when it is read."""
+
+    __slots__ = ('_function',)
+
+    def __init__(self, function):
+        self._function = function
+
+    @property
+    def value(self):
+        return self._function()
+
+
+class Metrics():
+    """
+    A registry of counters and gauges. Metrics are identified by a name
+    plus optional labels, and asking for the same name and labels twice
+    returns the same object, so hot paths can look a metric up once and
+    keep hold of it.
+    """
+
+    def __init__(self, prefix='beam_'):
+        self._prefix = prefix
+        self._metrics = OrderedDict()  # (name, labels) -> metric
+        self._types = {}  # name -> (type, help)
+
+    def _get(self, kind, cls, name, help, labels):
+        key = (name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            if self._types.setdefault(name, (kind, help))[0] != kind:
+                raise ValueError("metric {} is already registered as a {}".format(name, self._types[name][0]))
+            metric = self._metrics[key] = cls()
+        return metric
+
+    def counter(self, name, help='', **labels):
+        return self._get('counter', Counter, name, help, labels)
+
+    def gauge(self, name, help='', **labels):
+        return self._get('gauge', Gauge, name, help, labels)
+
+    def gauge_function(self, name, function, help='', **labels):
+        """Registers a gauge that calls function to get its value."""
+        self._types.setdefault(name, ('gauge', help))
+        key = (name, tuple(sorted(labels.items())))
+        self._metrics[key] = metric = _FunctionGauge(function)
+        return metric
+
+    def collect(self):
+        """
+        Returns a list of (name, labels, value) for every metric. This
+        may be called from another thread.
+        """
+        while True:
+            try:
+                items = list(self._metrics.items())
+                break
+            except RuntimeError:
+                # a metric was registered mid-copy; just try again
+                continue
+        return [(name, dict(labels), metric.value) for (name, labels), metric in items]
+
+    def snapshot(self):
+        """
+        Returns {name: value} for unlabelled metrics, and
+        {name: {label string: value}} for labelled ones.
+        """
+        result = {}
+        for name, labels, value in self.collect():
+            if labels:
+                key = ",".join("{}={}".format(k, v) for k, v in sorted(labels.items()))
+                result.setdefault(name, {})[key] = value
+            else:
+                result[name] = value
+        return result
+
+    def exposition(self):
+        """Renders every metric in the Prometheus text format."""
+        lines, seen = [], set()
+        for name, labels, value in sorted(self.collect(), key=lambda m: m[0]):
+            full_name = self._prefix + name
+            if name not in seen:
+                seen.add(name)
+                kind, help = self._types[name]
+                if help:
+                    lines.append("# HELP {} {}".format(full_name, help))
+                lines.append("# TYPE {} {}".format(full_name, kind))
+
+            if labels:
+                label_string = ",".join('{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"'))
+                                        for k, v in sorted(labels.items()))
+                lines.append("{}{{{}}} {}".format(full_name, label_string, value))
+            else:
+                lines.append("{} {}".format(full_name, value))
+
+        return "\n".join(lines) + "\n"
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class MetricsServer():
+    """
+    Serves a Metrics registry in the Prometheus text format at /metrics,
+    from a daemon thread.
+    """
+
+    def __init__(self, metrics, port=9100, host='127.0.0.1'):
+        self._server = _ThreadingHTTPServer((host, port), self._make_handler(metrics))
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @staticmethod
+    def _make_handler(metrics):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+
+                data = metrics.exposition().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
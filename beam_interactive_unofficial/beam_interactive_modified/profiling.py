@@ -0,0 +1,130 @@
+"""
+Hooks for profiling the client's hot paths. A hook is any object with
+begin(stage, packet_type) and end(stage, packet_type, token) methods;
+whatever begin returns is handed back to end as token. The stages are:
+
+decode       proto.decode, raw bytes -> protobuf packet
+push_packet  Connection._push_packet, decode plus queueing
+dispatch     BeamInteractiveClient._handle_packet, including the handler
+to_probuf    ProgressUpdate.to_probuf
+encode       proto.encode, protobuf packet -> bytes
+
+Instrumented code checks `if hooks:` before doing anything else, so
+with nothing installed the cost is one truthiness test per stage.
+"""
+
+import time
+from contextlib import contextmanager
+
+hooks = ()
+
+
+def install(hook):
+    """Installs a profiling hook. Returns the hook."""
+    global hooks
+    hooks = hooks + (hook,)
+    return hook
+
+
+def uninstall(hook):
+    """Removes a previously installed profiling hook."""
+    global hooks
+    hooks = tuple(h for h in hooks if h is not hook)
+
+
+def begin(stage, packet_type):
+    """
+    Calls begin on every installed hook. Returns the hooks along with
+    their tokens, so that end() reaches the same hooks even if some are
+    installed or removed in between.
+    """
+    installed = hooks
+    return installed, [hook.begin(stage, packet_type) for hook in installed]
+
+
+def end(stage, packet_type, tokens):
+    """Calls end on the hooks that begin() returned tokens for."""
+    installed, tokens = tokens
+    for hook, token in zip(installed, tokens):
+        hook.end(stage, packet_type, token)
+
+
+@contextmanager
+def measure(stage, packet_type=None):
+    """
+    Reports a block of code to the installed hooks as the given stage,
+    so that your own code can show up alongside the built-in stages.
+    """
+    if not hooks:
+        yield
+        return
+
+    tokens = begin(stage, packet_type)
+    try:
+        yield
+    finally:
+        end(stage, packet_type, tokens)
+
+
+class SamplingProfiler():
+    """
+    A hook that attributes time to each stage and packet type. Every
+    call is counted, but only one in `sample_every` is actually timed,
+    and the totals are extrapolated from those samples. Times are
+    inclusive, so dispatch includes any to_probuf/encode done by the
+    handler.
+
+        profiler = profiling.install(profiling.SamplingProfiler())
+        ...
+        print(profiler.report())
+    """
+
+    clock = staticmethod(time.perf_counter)
+
+    def __init__(self, sample_every=10):
+        self.sample_every = sample_every
+        self._calls = {}
+        self._timings = {}
+
+    def begin(self, stage, packet_type):
+        key = (stage, packet_type)
+        calls = self._calls[key] = self._calls.get(key, 0) + 1
+        if calls % self.sample_every:
+            return None
+        return self.clock()
+
+    def end(self, stage, packet_type, token):
+        if token is None:
+            return
+
+        elapsed = self.clock() - token
+        timing = self._timings.get((stage, packet_type))
+        if timing is None:
+            self._timings[(stage, packet_type)] = [1, elapsed, elapsed]
+        else:
+            timing[0] += 1
+            timing[1] += elapsed
+            if elapsed > timing[2]:
+                timing[2] = elapsed
+
+    def report(self):
+        """
+        Returns {stage: {packet type: stats}}, where stats has the number
+        of calls, how many were sampled, and the mean, max and estimated
+        total time in seconds.
+        """
+        result = {}
+        for (stage, packet_type), (samples, total, maximum) in self._timings.items():
+            calls = self._calls[(stage, packet_type)]
+            result.setdefault(stage, {})[packet_type] = {
+                'calls': calls,
+                'samples': samples,
+                'mean': total / samples,
+                'max': maximum,
+                'total': total / samples * calls,
+            }
+        return result
+
+    def reset(self):
+        self._calls = {}
+        self._timings = {}
@@ -1,4 +1,63 @@
-from .tetris_pb2 import Handshake, HandshakeACK, Report, \
-    Error, ProgressUpdate
-from .rw import encode, decode
-from .identifier import identifier as id
+import sys
+from importlib import import_module
+
+# The generated classes, and the codec that needs them, are loaded on
+# first use, so that protobuf is only imported once a packet is.
+_LAZY = {
+    'Handshake': '.tetris_pb2',
+    'HandshakeACK': '.tetris_pb2',
+    'Report': '.tetris_pb2',
+    'Error': '.tetris_pb2',
+    'ProgressUpdate': '.tetris_pb2',
+    'encode': '.rw',
+    'decode': '.rw',
+}
+
+
+def backend():
+    """
+    Returns the protobuf implementation the generated classes run on:
+    'upb' or 'cpp' for the compiled ones, or 'python' for the pure Python
+    fallback, which parses and serializes many times slower. Set
+    PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION before protobuf is imported
+    to pick one.
+    """
+    from google.protobuf.internal import api_implementation
+    return api_implementation.Type()
+
+
+def _old_protobuf():
+    """
+    Returns an explanation if the installed protobuf is too old for the
+    generated code in tetris_pb2, which needs 3.20 or later, or None.
+    """
+    try:
+        import google.protobuf
+    except ImportError:
+        return None
+    try:
+        from google.protobuf.internal import builder
+    except ImportError:
+        return "protobuf 3.20 or later is required, but {} is installed".format(
+            getattr(google.protobuf, '__version__', 'an older version'))
+    return None
+
+
+def __getattr__(name):
+    module = '.identifier' if name == 'id' else _LAZY.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    try:
+        imported = import_module(module, __name__)
+    except Exception as e:
+        reason = _old_protobuf() or e
+        raise ImportError("cannot import name {!r} from {!r}: {}".format(name, __name__, reason)) from e
+    value = imported.identifier if name == 'id' else getattr(imported, name)
+    globals()[name] = value
+    return value
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ (PEP 562) only exists from 3.7, so import everything up front
+    for _name in ['id'] + list(_LAZY):
+        __getattr__(_name)
@@ -44,6 +44,18 @@ class _Identifier():
 
         return None
 
+    def get_packet_name(self, id):
+        """
+        Returns the name of the packet having the given ID. Returns
+        None if one was not found.
+        """
+
+        for packet in self._packets:
+            if packet['id'] == id:
+                return packet['name']
+
+        return None
+
     def __getattr__(self, name):
         """
         Generic getter that can look up packet IDs by their name.
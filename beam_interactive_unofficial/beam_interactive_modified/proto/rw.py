@@ -1,17 +1,36 @@
+from google.protobuf.message import DecodeError
+
 from .identifier import identifier
+from .. import profiling
 from .varint import varuint_decode, varuint_encode, NotEnoughDataException
 from ..exceptions import EncoderException, DecoderException
 
 
 def encode(packet):
     """Encodes a single packet to a byte string. Returns the byte string."""
-    return _Encoder().encode(packet)
+    if not profiling.hooks:
+        return _Encoder().encode(packet)
+
+    packet_type = identifier.get_packet_name(identifier.get_packet_id(packet))
+    tokens = profiling.begin('encode', packet_type)
+    try:
+        return _Encoder().encode(packet)
+    finally:
+        profiling.end('encode', packet_type, tokens)
 
 
 def decode(bytes):
     """Attempts to decode the packet from the set of bytes. If the packet
     is not known, this function will return None."""
-    return _Decoder().decode(bytes)
+    if not profiling.hooks:
+        return _Decoder().decode(bytes)
+
+    packet_type = identifier.get_packet_name(bytes[0]) if bytes else None
+    tokens = profiling.begin('decode', packet_type)
+    try:
+        return _Decoder().decode(bytes)
+    finally:
+        profiling.end('decode', packet_type, tokens)
 
 
 class _Decoder():
@@ -47,7 +66,10 @@ class _Decoder():
             return None
 
         packet = Packet()
-        packet.ParseFromString(self.remaining_bytes())
+        try:
+            packet.ParseFromString(self.remaining_bytes())
+        except DecodeError as e:
+            raise DecoderException('invalid packet; {}'.format(e))
         return packet
 
 
@@ -1,13 +1,11 @@
+# -*- coding: utf-8 -*-
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # source: tetris.proto
-
-import sys
-_b=sys.version_info[0]<3 and (lambda x:x) or (lambda x:x.encode('latin1'))
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
 from google.protobuf import descriptor as _descriptor
-from google.protobuf import message as _message
-from google.protobuf import reflection as _reflection
+from google.protobuf import descriptor_pool as _descriptor_pool
 from google.protobuf import symbol_database as _symbol_database
-from google.protobuf import descriptor_pb2
 # @@protoc_insertion_point(imports)
 
 _sym_db = _symbol_database.Default()
@@ -15,809 +13,41 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor.FileDescriptor(
-  name='tetris.proto',
-  package='tetris',
-  serialized_pb=_b('\n\x0ctetris.proto\x12\x06tetris\"/\n\tHandshake\x12\x0f\n\x07\x63hannel\x18\x01 \x02(\r\x12\x11\n\tstreamKey\x18\x02 \x02(\t\"\x0e\n\x0cHandshakeACK\"\xea\x04\n\x06Report\x12\x0c\n\x04time\x18\x01 \x02(\r\x12#\n\x05users\x18\x02 \x02(\x0b\x32\x14.tetris.Report.Users\x12-\n\x08joystick\x18\x03 \x03(\x0b\x32\x1b.tetris.Report.JoystickInfo\x12+\n\x07tactile\x18\x04 \x03(\x0b\x32\x1a.tetris.Report.TactileInfo\x12)\n\x06screen\x18\x05 \x03(\x0b\x32\x19.tetris.Report.ScreenInfo\x1a\x62\n\x05Users\x12\x11\n\tconnected\x18\x01 \x02(\r\x12\x0e\n\x06quorum\x18\x02 \x02(\r\x12\x0e\n\x06\x61\x63tive\x18\x03 \x02(\r\x12&\n\x05qgram\x18\x04 \x03(\x0b\x32\x17.tetris.HistogramUint1D\x1aj\n\x0cJoystickInfo\x12\n\n\x02id\x18\x01 \x02(\r\x12%\n\tcoordMean\x18\x02 \x01(\x0b\x32\x12.tetris.Coordinate\x12\'\n\x0b\x63oordStddev\x18\x03 \x01(\x0b\x32\x12.tetris.Coordinate\x1a\\\n\x0bTactileInfo\x12\n\n\x02id\x18\x01 \x02(\r\x12\x0f\n\x07holding\x18\x02 \x01(\x01\x12\x16\n\x0epressFrequency\x18\x03 \x01(\x01\x12\x18\n\x10releaseFrequency\x18\x04 \x01(\x01\x1ax\n\nScreenInfo\x12\n\n\x02id\x18\x01 \x02(\r\x12\x0e\n\x06\x63licks\x18\x02 \x01(\x01\x12%\n\tcoordMean\x18\x03 \x01(\x0b\x32\x12.tetris.Coordinate\x12\'\n\x0b\x63oordStddev\x18\x04 \x01(\x0b\x32\x12.tetris.Coordinate\"\x18\n\x05\x45rror\x12\x0f\n\x07message\x18\x01 \x02(\t\"\xa6\x04\n\x0eProgressUpdate\x12\r\n\x05state\x18\x03 \x01(\t\x12\x37\n\x08joystick\x18\x01 \x03(\x0b\x32%.tetris.ProgressUpdate.JoystickUpdate\x12\x35\n\x07tactile\x18\x02 \x03(\x0b\x32$.tetris.ProgressUpdate.TactileUpdate\x12\x33\n\x06screen\x18\x04 \x03(\x0b\x32#.tetris.ProgressUpdate.ScreenUpdate\x1aP\n\x0eJoystickUpdate\x12\n\n\x02id\x18\x01 \x02(\r\x12\r\n\x05\x61ngle\x18\x02 \x01(\x01\x12\x11\n\tintensity\x18\x03 \x01(\x01\x12\x10\n\x08\x64isabled\x18\x04 \x01(\x08\x1a`\n\rTactileUpdate\x12\n\n\x02id\x18\x01 \x02(\r\x12\x10\n\x08\x63ooldown\x18\x02 \x01(\r\x12\r\n\x05\x66ired\x18\x03 \x01(\x08\x12\x10\n\x08progress\x18\x04 \x01(\x01\x12\x10\n\x08\x64isabled\x18\x05 \x01(\x08\x1a\xab\x01\n\x0cScreenUpdate\x12\n\n\x02id\x18\x01 \x02(\r\x12\x39\n\x06\x63licks\x18\x02 \x03(\x0b\x32).tetris.ProgressUpdate.ScreenUpdate.Click\x12\x10\n\x08\x64isabled\x18\x03 \x01(\x08\x1a\x42\n\x05\x43lick\x12&\n\ncoordinate\x18\x01 \x02(\x0b\x32\x12.tetris.Coordinate\x12\x11\n\tintensity\x18\x02 \x02(\x01\"\'\n\x0fHistogramUint1D\x12\t\n\x01x\x18\x01 \x02(\r\x12\t\n\x01y\x18\x02 \x02(\r\"\"\n\nCoordinate\x12\t\n\x01x\x18\x01 \x02(\x01\x12\t\n\x01y\x18\x02 \x02(\x01')
-)
-_sym_db.RegisterFileDescriptor(DESCRIPTOR)
-
-
-
-
-_HANDSHAKE = _descriptor.Descriptor(
-  name='Handshake',
-  full_name='tetris.Handshake',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='channel', full_name='tetris.Handshake.channel', index=0,
-      number=1, type=13, cpp_type=3, label=2,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='streamKey', full_name='tetris.Handshake.streamKey', index=1,
-      number=2, type=9, cpp_type=9, label=2,
-      has_default_value=False, default_value=_b("").decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  options=None,
-  is_extendable=False,
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=24,
-  serialized_end=71,
-)
-
-
-_HANDSHAKEACK = _descriptor.Descriptor(
-  name='HandshakeACK',
-  full_name='tetris.HandshakeACK',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  options=None,
-  is_extendable=False,
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=73,
-  serialized_end=87,
-)
-
-
-_REPORT_USERS = _descriptor.Descriptor(
-  name='Users',
-  full_name='tetris.Report.Users',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='connected', full_name='tetris.Report.Users.connected', index=0,
-      number=1, type=13, cpp_type=3, label=2,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='quorum', full_name='tetris.Report.Users.quorum', index=1,
-      number=2, type=13, cpp_type=3, label=2,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='active', full_name='tetris.Report.Users.active', index=2,
-      number=3, type=13, cpp_type=3, label=2,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='qgram', full_name='tetris.Report.Users.qgram', index=3,
-      number=4, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  options=None,
-  is_extendable=False,
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=286,
-  serialized_end=384,
-)
-
-_REPORT_JOYSTICKINFO = _descriptor.Descriptor(
-  name='JoystickInfo',
-  full_name='tetris.Report.JoystickInfo',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='id', full_name='tetris.Report.JoystickInfo.id', index=0,
-      number=1, type=13, cpp_type=3, label=2,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='coordMean', full_name='tetris.Report.JoystickInfo.coordMean', index=1,
-      number=2, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='coordStddev', full_name='tetris.Report.JoystickInfo.coordStddev', index=2,
-      number=3, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  options=None,
-  is_extendable=False,
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=386,
-  serialized_end=492,
-)
-
-_REPORT_TACTILEINFO = _descriptor.Descriptor(
-  name='TactileInfo',
-  full_name='tetris.Report.TactileInfo',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='id', full_name='tetris.Report.TactileInfo.id', index=0,
-      number=1, type=13, cpp_type=3, label=2,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='holding', full_name='tetris.Report.TactileInfo.holding', index=1,
-      number=2, type=1, cpp_type=5, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='pressFrequency', full_name='tetris.Report.TactileInfo.pressFrequency', index=2,
-      number=3, type=1, cpp_type=5, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='releaseFrequency', full_name='tetris.Report.TactileInfo.releaseFrequency', index=3,
-      number=4, type=1, cpp_type=5, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  options=None,
-  is_extendable=False,
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=494,
-  serialized_end=586,
-)
-
-_REPORT_SCREENINFO = _descriptor.Descriptor(
-  name='ScreenInfo',
-  full_name='tetris.Report.ScreenInfo',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='id', full_name='tetris.Report.ScreenInfo.id', index=0,
-      number=1, type=13, cpp_type=3, label=2,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='clicks', full_name='tetris.Report.ScreenInfo.clicks', index=1,
-      number=2, type=1, cpp_type=5, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='coordMean', full_name='tetris.Report.ScreenInfo.coordMean', index=2,
-      number=3, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='coordStddev', full_name='tetris.Report.ScreenInfo.coordStddev', index=3,
-      number=4, type=11, cpp_type=10, label=1,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  options=None,
-  is_extendable=False,
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=588,
-  serialized_end=708,
-)
-
-_REPORT = _descriptor.Descriptor(
-  name='Report',
-  full_name='tetris.Report',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='time', full_name='tetris.Report.time', index=0,
-      number=1, type=13, cpp_type=3, label=2,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='users', full_name='tetris.Report.users', index=1,
-      number=2, type=11, cpp_type=10, label=2,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='joystick', full_name='tetris.Report.joystick', index=2,
-      number=3, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='tactile', full_name='tetris.Report.tactile', index=3,
-      number=4, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='screen', full_name='tetris.Report.screen', index=4,
-      number=5, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-  ],
-  extensions=[
-  ],
-  nested_types=[_REPORT_USERS, _REPORT_JOYSTICKINFO, _REPORT_TACTILEINFO, _REPORT_SCREENINFO, ],
-  enum_types=[
-  ],
-  options=None,
-  is_extendable=False,
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=90,
-  serialized_end=708,
-)
-
-
-_ERROR = _descriptor.Descriptor(
-  name='Error',
-  full_name='tetris.Error',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='message', full_name='tetris.Error.message', index=0,
-      number=1, type=9, cpp_type=9, label=2,
-      has_default_value=False, default_value=_b("").decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  options=None,
-  is_extendable=False,
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=710,
-  serialized_end=734,
-)
-
-
-_PROGRESSUPDATE_JOYSTICKUPDATE = _descriptor.Descriptor(
-  name='JoystickUpdate',
-  full_name='tetris.ProgressUpdate.JoystickUpdate',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='id', full_name='tetris.ProgressUpdate.JoystickUpdate.id', index=0,
-      number=1, type=13, cpp_type=3, label=2,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='angle', full_name='tetris.ProgressUpdate.JoystickUpdate.angle', index=1,
-      number=2, type=1, cpp_type=5, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='intensity', full_name='tetris.ProgressUpdate.JoystickUpdate.intensity', index=2,
-      number=3, type=1, cpp_type=5, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='disabled', full_name='tetris.ProgressUpdate.JoystickUpdate.disabled', index=3,
-      number=4, type=8, cpp_type=7, label=1,
-      has_default_value=False, default_value=False,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  options=None,
-  is_extendable=False,
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=935,
-  serialized_end=1015,
-)
-
-_PROGRESSUPDATE_TACTILEUPDATE = _descriptor.Descriptor(
-  name='TactileUpdate',
-  full_name='tetris.ProgressUpdate.TactileUpdate',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='id', full_name='tetris.ProgressUpdate.TactileUpdate.id', index=0,
-      number=1, type=13, cpp_type=3, label=2,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='cooldown', full_name='tetris.ProgressUpdate.TactileUpdate.cooldown', index=1,
-      number=2, type=13, cpp_type=3, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='fired', full_name='tetris.ProgressUpdate.TactileUpdate.fired', index=2,
-      number=3, type=8, cpp_type=7, label=1,
-      has_default_value=False, default_value=False,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='progress', full_name='tetris.ProgressUpdate.TactileUpdate.progress', index=3,
-      number=4, type=1, cpp_type=5, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='disabled', full_name='tetris.ProgressUpdate.TactileUpdate.disabled', index=4,
-      number=5, type=8, cpp_type=7, label=1,
-      has_default_value=False, default_value=False,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  options=None,
-  is_extendable=False,
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=1017,
-  serialized_end=1113,
-)
-
-_PROGRESSUPDATE_SCREENUPDATE_CLICK = _descriptor.Descriptor(
-  name='Click',
-  full_name='tetris.ProgressUpdate.ScreenUpdate.Click',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='coordinate', full_name='tetris.ProgressUpdate.ScreenUpdate.Click.coordinate', index=0,
-      number=1, type=11, cpp_type=10, label=2,
-      has_default_value=False, default_value=None,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='intensity', full_name='tetris.ProgressUpdate.ScreenUpdate.Click.intensity', index=1,
-      number=2, type=1, cpp_type=5, label=2,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  options=None,
-  is_extendable=False,
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=1221,
-  serialized_end=1287,
-)
-
-_PROGRESSUPDATE_SCREENUPDATE = _descriptor.Descriptor(
-  name='ScreenUpdate',
-  full_name='tetris.ProgressUpdate.ScreenUpdate',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='id', full_name='tetris.ProgressUpdate.ScreenUpdate.id', index=0,
-      number=1, type=13, cpp_type=3, label=2,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='clicks', full_name='tetris.ProgressUpdate.ScreenUpdate.clicks', index=1,
-      number=2, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='disabled', full_name='tetris.ProgressUpdate.ScreenUpdate.disabled', index=2,
-      number=3, type=8, cpp_type=7, label=1,
-      has_default_value=False, default_value=False,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-  ],
-  extensions=[
-  ],
-  nested_types=[_PROGRESSUPDATE_SCREENUPDATE_CLICK, ],
-  enum_types=[
-  ],
-  options=None,
-  is_extendable=False,
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=1116,
-  serialized_end=1287,
-)
-
-_PROGRESSUPDATE = _descriptor.Descriptor(
-  name='ProgressUpdate',
-  full_name='tetris.ProgressUpdate',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='state', full_name='tetris.ProgressUpdate.state', index=0,
-      number=3, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=_b("").decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='joystick', full_name='tetris.ProgressUpdate.joystick', index=1,
-      number=1, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='tactile', full_name='tetris.ProgressUpdate.tactile', index=2,
-      number=2, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='screen', full_name='tetris.ProgressUpdate.screen', index=3,
-      number=4, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-  ],
-  extensions=[
-  ],
-  nested_types=[_PROGRESSUPDATE_JOYSTICKUPDATE, _PROGRESSUPDATE_TACTILEUPDATE, _PROGRESSUPDATE_SCREENUPDATE, ],
-  enum_types=[
-  ],
-  options=None,
-  is_extendable=False,
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=737,
-  serialized_end=1287,
-)
-
-
-_HISTOGRAMUINT1D = _descriptor.Descriptor(
-  name='HistogramUint1D',
-  full_name='tetris.HistogramUint1D',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='x', full_name='tetris.HistogramUint1D.x', index=0,
-      number=1, type=13, cpp_type=3, label=2,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='y', full_name='tetris.HistogramUint1D.y', index=1,
-      number=2, type=13, cpp_type=3, label=2,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  options=None,
-  is_extendable=False,
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=1289,
-  serialized_end=1328,
-)
-
-
-_COORDINATE = _descriptor.Descriptor(
-  name='Coordinate',
-  full_name='tetris.Coordinate',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='x', full_name='tetris.Coordinate.x', index=0,
-      number=1, type=1, cpp_type=5, label=2,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-    _descriptor.FieldDescriptor(
-      name='y', full_name='tetris.Coordinate.y', index=1,
-      number=2, type=1, cpp_type=5, label=2,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      options=None),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  options=None,
-  is_extendable=False,
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=1330,
-  serialized_end=1364,
-)
-
-_REPORT_USERS.fields_by_name['qgram'].message_type = _HISTOGRAMUINT1D
-_REPORT_USERS.containing_type = _REPORT
-_REPORT_JOYSTICKINFO.fields_by_name['coordMean'].message_type = _COORDINATE
-_REPORT_JOYSTICKINFO.fields_by_name['coordStddev'].message_type = _COORDINATE
-_REPORT_JOYSTICKINFO.containing_type = _REPORT
-_REPORT_TACTILEINFO.containing_type = _REPORT
-_REPORT_SCREENINFO.fields_by_name['coordMean'].message_type = _COORDINATE
-_REPORT_SCREENINFO.fields_by_name['coordStddev'].message_type = _COORDINATE
-_REPORT_SCREENINFO.containing_type = _REPORT
-_REPORT.fields_by_name['users'].message_type = _REPORT_USERS
-_REPORT.fields_by_name['joystick'].message_type = _REPORT_JOYSTICKINFO
-_REPORT.fields_by_name['tactile'].message_type = _REPORT_TACTILEINFO
-_REPORT.fields_by_name['screen'].message_type = _REPORT_SCREENINFO
-_PROGRESSUPDATE_JOYSTICKUPDATE.containing_type = _PROGRESSUPDATE
-_PROGRESSUPDATE_TACTILEUPDATE.containing_type = _PROGRESSUPDATE
-_PROGRESSUPDATE_SCREENUPDATE_CLICK.fields_by_name['coordinate'].message_type = _COORDINATE
-_PROGRESSUPDATE_SCREENUPDATE_CLICK.containing_type = _PROGRESSUPDATE_SCREENUPDATE
-_PROGRESSUPDATE_SCREENUPDATE.fields_by_name['clicks'].message_type = _PROGRESSUPDATE_SCREENUPDATE_CLICK
-_PROGRESSUPDATE_SCREENUPDATE.containing_type = _PROGRESSUPDATE
-_PROGRESSUPDATE.fields_by_name['joystick'].message_type = _PROGRESSUPDATE_JOYSTICKUPDATE
-_PROGRESSUPDATE.fields_by_name['tactile'].message_type = _PROGRESSUPDATE_TACTILEUPDATE
-_PROGRESSUPDATE.fields_by_name['screen'].message_type = _PROGRESSUPDATE_SCREENUPDATE
-DESCRIPTOR.message_types_by_name['Handshake'] = _HANDSHAKE
-DESCRIPTOR.message_types_by_name['HandshakeACK'] = _HANDSHAKEACK
-DESCRIPTOR.message_types_by_name['Report'] = _REPORT
-DESCRIPTOR.message_types_by_name['Error'] = _ERROR
-DESCRIPTOR.message_types_by_name['ProgressUpdate'] = _PROGRESSUPDATE
-DESCRIPTOR.message_types_by_name['HistogramUint1D'] = _HISTOGRAMUINT1D
-DESCRIPTOR.message_types_by_name['Coordinate'] = _COORDINATE
-
-Handshake = _reflection.GeneratedProtocolMessageType('Handshake', (_message.Message,), dict(
-  DESCRIPTOR = _HANDSHAKE,
-  __module__ = 'tetris_pb2'
-  # @@protoc_insertion_point(class_scope:tetris.Handshake)
-  ))
-_sym_db.RegisterMessage(Handshake)
-
-HandshakeACK = _reflection.GeneratedProtocolMessageType('HandshakeACK', (_message.Message,), dict(
-  DESCRIPTOR = _HANDSHAKEACK,
-  __module__ = 'tetris_pb2'
-  # @@protoc_insertion_point(class_scope:tetris.HandshakeACK)
-  ))
-_sym_db.RegisterMessage(HandshakeACK)
-
-Report = _reflection.GeneratedProtocolMessageType('Report', (_message.Message,), dict(
-
-  Users = _reflection.GeneratedProtocolMessageType('Users', (_message.Message,), dict(
-    DESCRIPTOR = _REPORT_USERS,
-    __module__ = 'tetris_pb2'
-    # @@protoc_insertion_point(class_scope:tetris.Report.Users)
-    ))
-  ,
-
-  JoystickInfo = _reflection.GeneratedProtocolMessageType('JoystickInfo', (_message.Message,), dict(
-    DESCRIPTOR = _REPORT_JOYSTICKINFO,
-    __module__ = 'tetris_pb2'
-    # @@protoc_insertion_point(class_scope:tetris.Report.JoystickInfo)
-    ))
-  ,
-
-  TactileInfo = _reflection.GeneratedProtocolMessageType('TactileInfo', (_message.Message,), dict(
-    DESCRIPTOR = _REPORT_TACTILEINFO,
-    __module__ = 'tetris_pb2'
-    # @@protoc_insertion_point(class_scope:tetris.Report.TactileInfo)
-    ))
-  ,
-
-  ScreenInfo = _reflection.GeneratedProtocolMessageType('ScreenInfo', (_message.Message,), dict(
-    DESCRIPTOR = _REPORT_SCREENINFO,
-    __module__ = 'tetris_pb2'
-    # @@protoc_insertion_point(class_scope:tetris.Report.ScreenInfo)
-    ))
-  ,
-  DESCRIPTOR = _REPORT,
-  __module__ = 'tetris_pb2'
-  # @@protoc_insertion_point(class_scope:tetris.Report)
-  ))
-_sym_db.RegisterMessage(Report)
-_sym_db.RegisterMessage(Report.Users)
-_sym_db.RegisterMessage(Report.JoystickInfo)
-_sym_db.RegisterMessage(Report.TactileInfo)
-_sym_db.RegisterMessage(Report.ScreenInfo)
-
-Error = _reflection.GeneratedProtocolMessageType('Error', (_message.Message,), dict(
-  DESCRIPTOR = _ERROR,
-  __module__ = 'tetris_pb2'
-  # @@protoc_insertion_point(class_scope:tetris.Error)
-  ))
-_sym_db.RegisterMessage(Error)
-
-ProgressUpdate = _reflection.GeneratedProtocolMessageType('ProgressUpdate', (_message.Message,), dict(
-
-  JoystickUpdate = _reflection.GeneratedProtocolMessageType('JoystickUpdate', (_message.Message,), dict(
-    DESCRIPTOR = _PROGRESSUPDATE_JOYSTICKUPDATE,
-    __module__ = 'tetris_pb2'
-    # @@protoc_insertion_point(class_scope:tetris.ProgressUpdate.JoystickUpdate)
-    ))
-  ,
-
-  TactileUpdate = _reflection.GeneratedProtocolMessageType('TactileUpdate', (_message.Message,), dict(
-    DESCRIPTOR = _PROGRESSUPDATE_TACTILEUPDATE,
-    __module__ = 'tetris_pb2'
-    # @@protoc_insertion_point(class_scope:tetris.ProgressUpdate.TactileUpdate)
-    ))
-  ,
-
-  ScreenUpdate = _reflection.GeneratedProtocolMessageType('ScreenUpdate', (_message.Message,), dict(
-
-    Click = _reflection.GeneratedProtocolMessageType('Click', (_message.Message,), dict(
-      DESCRIPTOR = _PROGRESSUPDATE_SCREENUPDATE_CLICK,
-      __module__ = 'tetris_pb2'
-      # @@protoc_insertion_point(class_scope:tetris.ProgressUpdate.ScreenUpdate.Click)
-      ))
-    ,
-    DESCRIPTOR = _PROGRESSUPDATE_SCREENUPDATE,
-    __module__ = 'tetris_pb2'
-    # @@protoc_insertion_point(class_scope:tetris.ProgressUpdate.ScreenUpdate)
-    ))
-  ,
-  DESCRIPTOR = _PROGRESSUPDATE,
-  __module__ = 'tetris_pb2'
-  # @@protoc_insertion_point(class_scope:tetris.ProgressUpdate)
-  ))
-_sym_db.RegisterMessage(ProgressUpdate)
-_sym_db.RegisterMessage(ProgressUpdate.JoystickUpdate)
-_sym_db.RegisterMessage(ProgressUpdate.TactileUpdate)
-_sym_db.RegisterMessage(ProgressUpdate.ScreenUpdate)
-_sym_db.RegisterMessage(ProgressUpdate.ScreenUpdate.Click)
-
-HistogramUint1D = _reflection.GeneratedProtocolMessageType('HistogramUint1D', (_message.Message,), dict(
-  DESCRIPTOR = _HISTOGRAMUINT1D,
-  __module__ = 'tetris_pb2'
-  # @@protoc_insertion_point(class_scope:tetris.HistogramUint1D)
-  ))
-_sym_db.RegisterMessage(HistogramUint1D)
-
-Coordinate = _reflection.GeneratedProtocolMessageType('Coordinate', (_message.Message,), dict(
-  DESCRIPTOR = _COORDINATE,
-  __module__ = 'tetris_pb2'
-  # @@protoc_insertion_point(class_scope:tetris.Coordinate)
-  ))
-_sym_db.RegisterMessage(Coordinate)
-
-
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0ctetris.proto\x12\x06tetris\"/\n\tHandshake\x12\x0f\n\x07\x63hannel\x18\x01 \x02(\r\x12\x11\n\tstreamKey\x18\x02 \x02(\t\"\x0e\n\x0cHandshakeACK\"\xea\x04\n\x06Report\x12\x0c\n\x04time\x18\x01 \x02(\r\x12#\n\x05users\x18\x02 \x02(\x0b\x32\x14.tetris.Report.Users\x12-\n\x08joystick\x18\x03 \x03(\x0b\x32\x1b.tetris.Report.JoystickInfo\x12+\n\x07tactile\x18\x04 \x03(\x0b\x32\x1a.tetris.Report.TactileInfo\x12)\n\x06screen\x18\x05 \x03(\x0b\x32\x19.tetris.Report.ScreenInfo\x1a\x62\n\x05Users\x12\x11\n\tconnected\x18\x01 \x02(\r\x12\x0e\n\x06quorum\x18\x02 \x02(\r\x12\x0e\n\x06\x61\x63tive\x18\x03 \x02(\r\x12&\n\x05qgram\x18\x04 \x03(\x0b\x32\x17.tetris.HistogramUint1D\x1aj\n\x0cJoystickInfo\x12\n\n\x02id\x18\x01 \x02(\r\x12%\n\tcoordMean\x18\x02 \x01(\x0b\x32\x12.tetris.Coordinate\x12\'\n\x0b\x63oordStddev\x18\x03 \x01(\x0b\x32\x12.tetris.Coordinate\x1a\\\n\x0bTactileInfo\x12\n\n\x02id\x18\x01 \x02(\r\x12\x0f\n\x07holding\x18\x02 \x01(\x01\x12\x16\n\x0epressFrequency\x18\x03 \x01(\x01\x12\x18\n\x10releaseFrequency\x18\x04 \x01(\x01\x1ax\n\nScreenInfo\x12\n\n\x02id\x18\x01 \x02(\r\x12\x0e\n\x06\x63licks\x18\x02 \x01(\x01\x12%\n\tcoordMean\x18\x03 \x01(\x0b\x32\x12.tetris.Coordinate\x12\'\n\x0b\x63oordStddev\x18\x04 \x01(\x0b\x32\x12.tetris.Coordinate\"\x18\n\x05\x45rror\x12\x0f\n\x07message\x18\x01 \x02(\t\"\xa6\x04\n\x0eProgressUpdate\x12\r\n\x05state\x18\x03 \x01(\t\x12\x37\n\x08joystick\x18\x01 \x03(\x0b\x32%.tetris.ProgressUpdate.JoystickUpdate\x12\x35\n\x07tactile\x18\x02 \x03(\x0b\x32$.tetris.ProgressUpdate.TactileUpdate\x12\x33\n\x06screen\x18\x04 \x03(\x0b\x32#.tetris.ProgressUpdate.ScreenUpdate\x1aP\n\x0eJoystickUpdate\x12\n\n\x02id\x18\x01 \x02(\r\x12\r\n\x05\x61ngle\x18\x02 \x01(\x01\x12\x11\n\tintensity\x18\x03 \x01(\x01\x12\x10\n\x08\x64isabled\x18\x04 \x01(\x08\x1a`\n\rTactileUpdate\x12\n\n\x02id\x18\x01 \x02(\r\x12\x10\n\x08\x63ooldown\x18\x02 \x01(\r\x12\r\n\x05\x66ired\x18\x03 \x01(\x08\x12\x10\n\x08progress\x18\x04 \x01(\x01\x12\x10\n\x08\x64isabled\x18\x05 \x01(\x08\x1a\xab\x01\n\x0cScreenUpdate\x12\n\n\x02id\x18\x01 \x02(\r\x12\x39\n\x06\x63licks\x18\x02 \x03(\x0b\x32).tetris.ProgressUpdate.ScreenUpdate.Click\x12\x10\n\x08\x64isabled\x18\x03 \x01(\x08\x1a\x42\n\x05\x43lick\x12&\n\ncoordinate\x18\x01 \x02(\x0b\x32\x12.tetris.Coordinate\x12\x11\n\tintensity\x18\x02 \x02(\x01\"\'\n\x0fHistogramUint1D\x12\t\n\x01x\x18\x01 \x02(\r\x12\t\n\x01y\x18\x02 \x02(\r\"\"\n\nCoordinate\x12\t\n\x01x\x18\x01 \x02(\x01\x12\t\n\x01y\x18\x02 \x02(\x01')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'tetris_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _HANDSHAKE._serialized_start=24
+  _HANDSHAKE._serialized_end=71
+  _HANDSHAKEACK._serialized_start=73
+  _HANDSHAKEACK._serialized_end=87
+  _REPORT._serialized_start=90
+  _REPORT._serialized_end=708
+  _REPORT_USERS._serialized_start=286
+  _REPORT_USERS._serialized_end=384
+  _REPORT_JOYSTICKINFO._serialized_start=386
+  _REPORT_JOYSTICKINFO._serialized_end=492
+  _REPORT_TACTILEINFO._serialized_start=494
+  _REPORT_TACTILEINFO._serialized_end=586
+  _REPORT_SCREENINFO._serialized_start=588
+  _REPORT_SCREENINFO._serialized_end=708
+  _ERROR._serialized_start=710
+  _ERROR._serialized_end=734
+  _PROGRESSUPDATE._serialized_start=737
+  _PROGRESSUPDATE._serialized_end=1287
+  _PROGRESSUPDATE_JOYSTICKUPDATE._serialized_start=935
+  _PROGRESSUPDATE_JOYSTICKUPDATE._serialized_end=1015
+  _PROGRESSUPDATE_TACTILEUPDATE._serialized_start=1017
+  _PROGRESSUPDATE_TACTILEUPDATE._serialized_end=1113
+  _PROGRESSUPDATE_SCREENUPDATE._serialized_start=1116
+  _PROGRESSUPDATE_SCREENUPDATE._serialized_end=1287
+  _PROGRESSUPDATE_SCREENUPDATE_CLICK._serialized_start=1221
+  _PROGRESSUPDATE_SCREENUPDATE_CLICK._serialized_end=1287
+  _HISTOGRAMUINT1D._serialized_start=1289
+  _HISTOGRAMUINT1D._serialized_end=1328
+  _COORDINATE._serialized_start=1330
+  _COORDINATE._serialized_end=1364
 # @@protoc_insertion_point(module_scope)
@@ -0,0 +1,81 @@
+import asyncio
+
+
+class Watchdog():
+    """
+    Notices when a connection goes quiet. The connection stamps
+    last_frame_at whenever a frame arrives, and the watchdog checks
+    it on a single timer, rather than every read being wrapped in
+    its own timeout. If nothing has arrived for `timeout` seconds,
+    the connection is closed and timed_out is set.
+
+    With ping_interval set, the watchdog also sends a websocket ping
+    once the connection has been idle that long. A pong counts as
+    activity, and its round trip time is kept in rtt.
+    """
+
+    def __init__(self, connection, timeout, ping_interval=None, metrics=None):
+        self._connection = connection
+        self._loop = connection._loop
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self.timed_out = False
+        self.rtt = None
+
+        self._handle = None
+        self._ping_task = None
+        self._rtt_gauge = metrics.gauge('rtt_seconds', "Websocket ping round trip time") \
+            if metrics is not None else None
+
+    def start(self):
+        self._schedule(self.timeout if self.ping_interval is None else min(self.timeout, self.ping_interval))
+        return self
+
+    def stop(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._ping_task is not None:
+            self._ping_task.cancel()
+            self._ping_task = None
+
+    def _schedule(self, delay):
+        self._handle = self._loop.call_later(max(delay, 0), self._check)
+
+    def _check(self):
+        connection = self._connection
+        if connection.closed:
+            self._handle = None
+            return
+
+        idle = self._loop.time() - connection.last_frame_at
+        if idle >= self.timeout:
+            self.timed_out = True
+            self._handle = None
+            connection.close()
+            return
+
+        delay = self.timeout - idle
+        if self.ping_interval is not None and self._ping_task is None:
+            if idle >= self.ping_interval:
+                self._ping_task = self._loop.create_task(self._ping())
+            else:
+                delay = min(delay, self.ping_interval - idle)
+        self._schedule(delay)
+
+    @asyncio.coroutine
+    def _ping(self):
+        try:
+            sent = self._loop.time()
+            pong = yield from self._connection._socket.ping()
+            yield from pong
+        except Exception:
+            return  # the connection is going away; the timeout will notice
+        finally:
+            self._ping_task = None
+
+        now = self._loop.time()
+        self._connection.last_frame_at = now
+        self.rtt = now - sent
+        if self._rtt_gauge is not None:
+            self._rtt_gauge.set(self.rtt)
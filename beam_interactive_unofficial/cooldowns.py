@@ -0,0 +1,239 @@
+class TimerWheel:
+    """
+    A hierarchical timer wheel. Time is counted in whole ticks; each
+    level has `slots` slots (a power of two), and level n covers
+    deadlines up to slots**(n+1) ticks away. Adding and removing a timer
+    is O(1), and advancing is O(1) per tick plus the timers that expire,
+    with timers on the outer levels moved inwards as their slot comes
+    round. Deadlines further away than the wheel covers are parked in
+    the outermost level until they come into range.
+    """
+
+    def __init__(self, slots=64, levels=4, tick=0):
+        if slots & (slots - 1):
+            raise ValueError("slots must be a power of two")
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._span = slots ** levels
+        self._levels = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._where = {}  # key -> (level, slot)
+        # The next tick that advance() will process
+        self.tick = tick
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, key):
+        return key in self._where
+
+    def add(self, key, deadline):
+        """Adds a timer for key expiring at the given tick, replacing any existing one."""
+        where = self._where.get(key)
+        if where is not None:
+            del self._levels[where[0]][where[1]][key]
+
+        if deadline < self.tick:
+            # Already due; it goes out on the next tick
+            deadline = self.tick
+        # Out of range deadlines are filed as far out as the wheel goes, and
+        # filed again with their real deadline when they cascade
+        filed = min(deadline, self.tick + self._span - 1)
+
+        # The level is however many whole levels of bits the distance spans
+        level = ((filed - self.tick).bit_length() - 1) // self._bits if filed > self.tick else 0
+        slot = (filed >> (self._bits * level)) & self._mask
+        self._levels[level][slot][key] = deadline
+        self._where[key] = (level, slot)
+
+    def remove(self, key):
+        """Removes key's timer, if it has one."""
+        where = self._where.pop(key, None)
+        if where is not None:
+            level, slot = where
+            del self._levels[level][slot][key]
+
+    def deadline(self, key):
+        """Returns the tick key's timer expires at, or None."""
+        where = self._where.get(key)
+        if where is None:
+            return None
+        level, slot = where
+        return self._levels[level][slot][key]
+
+    def next_tick(self):
+        """
+        Returns the first tick on which advance() has something to do -
+        a timer to expire, or a slot of timers to move inwards - or None
+        if there are no timers.
+        """
+        if not self._where:
+            return None
+        tick, bits, mask = self.tick, self._bits, self._mask
+        found = None
+        level0 = self._levels[0]
+        for t in range(tick, tick + mask + 1):
+            if level0[t & mask]:
+                found = t
+                break
+        # Level n's slots are moved inwards on multiples of slots**n ticks
+        for level in range(1, len(self._levels)):
+            shift = bits * level
+            slots = self._levels[level]
+            first = -(-tick >> shift)
+            for n in range(first, first + mask + 1):
+                if found is not None and n << shift >= found:
+                    break
+                if slots[n & mask]:
+                    found = n << shift
+                    break
+        return found
+
+    def _cascade(self, level):
+        """Moves the timers in a level's current slot inwards. Returns the slot index."""
+        index = (self.tick >> (self._bits * level)) & self._mask
+        timers = self._levels[level][index]
+        if timers:
+            self._levels[level][index] = {}
+            # add() without the bookkeeping it doesn't need here: none of these
+            # are filed anywhere else, and none are already due
+            tick, bits, mask, levels, where = self.tick, self._bits, self._mask, self._levels, self._where
+            last = tick + self._span - 1
+            for key, deadline in timers.items():
+                filed = deadline if deadline < last else last
+                inner = ((filed - tick).bit_length() - 1) // bits if filed > tick else 0
+                slot = (filed >> (bits * inner)) & mask
+                levels[inner][slot][key] = deadline
+                where[key] = (inner, slot)
+        return index
+
+    def advance(self, tick):
+        """
+        Processes every tick up to and including the given one, and
+        returns the keys whose timers expired, in deadline order.
+        """
+        expired = []
+        if not self._where:
+            self.tick = max(self.tick, tick + 1)
+            return expired
+
+        level0 = self._levels[0]
+        while self.tick <= tick:
+            index = self.tick & self._mask
+            if not index:
+                level = 1
+                while level < len(self._levels) and not self._cascade(level):
+                    level += 1
+
+            timers = level0[index]
+            if timers:
+                level0[index] = {}
+                for key in timers:
+                    del self._where[key]
+                expired.extend(timers)
+            self.tick += 1
+
+            if not self._where:
+                self.tick = max(self.tick, tick + 1)
+                break
+        return expired
+
+
+class CooldownTracker:
+    """
+    Remembers when each tactile's cooldown runs out, so the client can
+    skip sending a cooldown to a button that is still cooling down for
+    at least as long, and tell you when buttons become usable again.
+
+    Expiries are kept in a TimerWheel with `resolution` seconds per tick.
+    The loop only wakes up on ticks where the wheel has something to do,
+    so a long cooldown costs a handful of wakeups rather than one per
+    tick, and none at all once nothing is cooling down. Buttons whose
+    cooldowns run out on the same tick are passed to on_expire together,
+    as one list.
+    """
+
+    def __init__(self, loop, on_expire=lambda ids: None, resolution=0.01):
+        self._loop = loop
+        self._on_expire = on_expire
+        self.resolution = resolution
+        self._origin = loop.time()
+        self._wheel = TimerWheel()
+        self._timer = None
+        self._timer_tick = None
+
+    def __len__(self):
+        return len(self._wheel)
+
+    def _now(self):
+        return int((self._loop.time() - self._origin) / self.resolution)
+
+    def start(self, tactile_ids, length):
+        """
+        Records a cooldown of length milliseconds on each of the given
+        tactiles, and returns the ones that actually need sending - that
+        is, leaving out those already cooling down until at least then.
+        """
+        now = self._now()
+        if not self._wheel:
+            # Nothing has driven the wheel while it was empty, so catch it up first
+            self._wheel.advance(now - 1)
+        # Round up, so a cooldown is never reported over before the server's is
+        deadline = now + int(-(-length // (self.resolution * 1000)))
+        needed = []
+        for tactile_id in tactile_ids:
+            current = self._wheel.deadline(tactile_id)
+            if current is not None and current >= deadline:
+                continue
+            self._wheel.add(tactile_id, deadline)
+            needed.append(tactile_id)
+
+        if needed:
+            self._schedule()
+        return needed
+
+    def remaining(self, tactile_id):
+        """Returns the seconds left on a tactile's cooldown, or 0 if it isn't cooling down."""
+        deadline = self._wheel.deadline(tactile_id)
+        if deadline is None:
+            return 0
+        return max(0, (deadline + 1) * self.resolution - (self._loop.time() - self._origin))
+
+    def cooling(self, tactile_id):
+        return tactile_id in self._wheel
+
+    def cancel(self, tactile_ids=None):
+        """Forgets the cooldowns on the given tactiles, or all of them."""
+        if tactile_ids is None:
+            self._wheel = TimerWheel(tick=self._wheel.tick)
+        else:
+            for tactile_id in tactile_ids:
+                self._wheel.remove(tactile_id)
+        self._schedule()
+
+    def _schedule(self):
+        """
+        Arms the timer for the wheel's next tick with work in it, unless
+        it is armed for a sooner one already.
+        """
+        tick = self._wheel.next_tick()
+        if self._timer is not None:
+            if tick is not None and self._timer_tick <= tick:
+                return
+            self._timer.cancel()
+            self._timer = None
+        if tick is not None:
+            # Wake up once the tick is over, so its timers count as expired
+            self._timer = self._loop.call_at(self._origin + (tick + 1) * self.resolution, self._advance)
+            self._timer_tick = tick
+
+    def _advance(self):
+        self._timer = None
+        expired = self._wheel.advance(self._now() - 1)
+        self._schedule()
+        if expired:
+            self._on_expire(expired)
+
+    def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
@@ -1,33 +1,97 @@
 import asyncio
+import threading
+import time
 from urllib.parse import urljoin
 
 import requests
+import websockets
 
 from beam_interactive_unofficial.progress_update import *
 from beam_interactive_unofficial.exceptions import *
-from beam_interactive_unofficial.beam_interactive_modified import start, proto, connection
+from beam_interactive_unofficial.streams import PacketStream
+from beam_interactive_unofficial.rate_limit import OutboundScheduler, TickScheduler
+from beam_interactive_unofficial.packet_cache import PacketCache, cache_key
+from beam_interactive_unofficial.cooldowns import CooldownTracker
+from beam_interactive_unofficial.report_diff import ReportDiffer
+from beam_interactive_unofficial.audience import AudienceAnalytics
+from beam_interactive_unofficial.beam_interactive_modified import start, open_socket, proto, connection, \
+    LatencyRecorder, Metrics, MetricsServer, CaptureWriter, Watchdog, profiling
 
 from requests.exceptions import ConnectionError
 
 URL = "https://beam.pro/api/v1/"
 
+# How many pre-encoded tactile_fire/tactile_cooldown templates to keep
+_MAX_TEMPLATES = 64
+
 
 # noinspection PyAttributeOutsideInit
 class BeamInteractiveClient:
     def __init__(self, oauth, timeout: int, on_connect=lambda x: None, on_report=lambda x: None, debug=False,
-                 on_error=lambda x: None, auto_reconnect=False, max_reconnect_attempts=-1, reconnect_delay=5):
+                 on_error=lambda x: None, auto_reconnect=False, max_reconnect_attempts=-1, reconnect_delay=5,
+                 api_url=URL, measure_latency=False, capture=None, ping_interval=None, rate_limit=None,
+                 burst=None, packet_cache_size=256, fast_start=False, robot=None, compression=None,
+                 tick_rate=None, track_cooldowns=False, on_cooldown_end=lambda ids: None,
+                 on_changes=None, change_epsilon=0.0, track_audience=False):
 
         self._on_connect, self._on_report, self._on_error = on_connect, on_report, on_error
         self._max_reconn, self._auto_reconnect = max_reconnect_attempts, auto_reconnect
         self._reconnect_delay = reconnect_delay
         self._oauth = oauth
+        self._api_url = api_url
         self._timeout = timeout
+        self._ping_interval = ping_interval
+        self._compression = compression
+        self._fast_start = fast_start
+        # (channel id, robot address, robot key) from config or the last
+        # session; fast_start uses it to open the socket before the API answers
+        self.robot = tuple(robot) if robot is not None else None
+        self.watchdog = None
+        if rate_limit is not None and tick_rate is not None:
+            raise ValueError("rate_limit and tick_rate can't be used together")
+        self._rate_limit, self._burst = rate_limit, burst
+        self._tick_rate = tick_rate
+        self._track_cooldowns, self._on_cooldown_end = track_cooldowns, asyncio.coroutine(on_cooldown_end)
+        self.cooldowns = None
+        self.scheduler = None
         self._debug = debug
+        self.latency = LatencyRecorder() if measure_latency else None
+        self.capture = CaptureWriter(capture) if isinstance(capture, str) else capture
+        self.metrics = Metrics()
+        self._reconnects = self.metrics.counter('reconnects_total', "Reconnection attempts")
+        self._handshake_time = self.metrics.gauge('handshake_seconds', "Time from connecting to HandshakeACK")
+        self._fast_start_hits = self.metrics.counter('fast_start_hits_total',
+                                                     "Fast starts where the predicted robot was right")
+        self._fast_start_misses = self.metrics.counter('fast_start_misses_total',
+                                                       "Fast starts that fell back to the API's robot")
+        self.metrics.gauge('protobuf_backend', "Protobuf implementation in use", backend=proto.backend()).set(1)
+        self.packet_cache = PacketCache(packet_cache_size, self.metrics) if packet_cache_size else None
+        self._connect_started = None
+        self._receive_task = None
+        # The task running _receive(), if any; streams are fed by it rather than reading themselves
+        self._receiving = None
+        self._pull_task = None
+        self._streams = []
+        self._templates = {}
+        self._precompiled = {}
+        self._started = False
+        self.connection = None
         self._handlers = {
             proto.id.handshake_ack: asyncio.coroutine(on_connect),
             proto.id.report: asyncio.coroutine(on_report),
             proto.id.error: asyncio.coroutine(on_error)
         }
+        # With on_changes, each report is diffed against the last and the
+        # handler gets just the controls that changed (see ReportDiffer)
+        self.differ = ReportDiffer(change_epsilon) if on_changes is not None else None
+        self._on_changes = asyncio.coroutine(on_changes) if on_changes is not None else None
+        # Streaming statistics over Report.users, if track_audience is set
+        self.audience = None
+        if track_audience:
+            self.audience = AudienceAnalytics()
+            self.audience.register_metrics(self.metrics)
+        # kind -> {control id: ((handler, coroutine), ...)}, for on_tactile() and friends
+        self._subscriptions = {'tactile': {}, 'joystick': {}, 'screen': {}}
 
     def start(self, _attempt=0, _reconnect=False):
         """Start the connection to Beam."""
@@ -35,6 +99,9 @@ class BeamInteractiveClient:
         self.state = None
         self._started = False
         self._num_buttons = None
+        self._templates.clear()
+        if _reconnect:
+            self._reconnects.inc()
 
         self.loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self.loop)
@@ -43,10 +110,12 @@ class BeamInteractiveClient:
             e = self.loop.run_until_complete(asyncio.gather(
                 self._run(delay=(self._reconnect_delay if _reconnect else None)), return_exceptions=True))
         finally:
-            tasks = asyncio.gather(*asyncio.Task.all_tasks(), return_exceptions=True)
+            tasks = asyncio.gather(*asyncio.Task.all_tasks(loop=self.loop), loop=self.loop, return_exceptions=True)
             tasks.cancel()
             self.loop.run_until_complete(tasks)
             self.loop.close()
+            if self.capture is not None:
+                self.capture.flush()
 
             if e is not None:
                 if isinstance(e[0], asyncio.TimeoutError):
@@ -60,25 +129,210 @@ class BeamInteractiveClient:
                                                             .format(self._max_reconn)) if _reconnect else "")
                     self.start(_attempt=_attempt + 1, _reconnect=True)
 
-    def send(self, update: (ProgressUpdate, JoystickUpdate, TactileUpdate, ScreenUpdate, dict, str)):
-        """Send a progress update to Beam."""
+    def send(self, update: (ProgressUpdate, JoystickUpdate, TactileUpdate, ScreenUpdate, dict, str), priority=None):
+        """
+        Send a progress update to Beam. If the client has a rate_limit,
+        priority can be 'critical', 'normal' or 'cosmetic' to override
+        the class the update would otherwise be given (see OutboundScheduler).
+        If it has a tick_rate, the update goes out with the next tick (see
+        TickScheduler).
+
+        A protobuf ProgressUpdate that is already built, such as one from
+        JoystickPipeline.build(), is sent as it is. With a rate_limit or
+        tick_rate it is turned back into a ProgressUpdate first, so that
+        it is scheduled like any other update.
+        """
         self._check_started()
-
-        if isinstance(update, ProgressUpdate):
-            progress = update
-        elif isinstance(update, (JoystickUpdate, TactileUpdate, ScreenUpdate)):
-            progress = update.wrap()
-        elif isinstance(update, dict):
-            progress = ProgressUpdate.from_dict(update)
-        elif isinstance(update, str):
-            progress = ProgressUpdate.from_json(update)
+        if isinstance(update, proto.ProgressUpdate):
+            if self.scheduler is None:
+                if update.HasField('state'):
+                    self.state = update.state
+                self.connection.send(update)
+                return
+            update = ProgressUpdate.from_probuf(update)
+
+        if self.scheduler is not None:
+            self.scheduler.submit(self._to_progress(update), priority)
+        elif self.packet_cache is not None:
+            self.connection.send_encoded(self._encode_cached(update))
         else:
-            raise ValueError("Invalid data type - must be a ProgressUpdate, TactileUpdate, ScreenUpdate, dict or str.")
-
+            self.connection.send(self._to_probuf(update))
+
+    def precompile(self, name, update: (ProgressUpdate, JoystickUpdate, TactileUpdate, ScreenUpdate, dict, str)):
+        """
+        Encode an update once and keep it under a name, so that
+        send_precompiled(name) can resend it without any conversion or
+        encoding. Later changes to the update object are not picked up.
+        """
+        progress = self._to_progress(update, track_state=False)
+        self._precompiled[name] = (proto.encode(progress.to_probuf()), progress)
+
+    def send_precompiled(self, name):
+        """Send an update previously stored with precompile()."""
+        self._check_started()
+        data, progress = self._precompiled[name]
         if progress.state is not None:
             self.state = progress.state
-        progress_probuf = progress.to_probuf()
-        self.connection.send(progress_probuf)
+        if self.scheduler is not None:
+            self.scheduler.submit(progress)
+        else:
+            self.connection.send_encoded(data)
+
+    @asyncio.coroutine
+    def send_coro(self, update: (ProgressUpdate, JoystickUpdate, TactileUpdate, ScreenUpdate, dict, str)):
+        """
+        Send a progress update to Beam, returning once it has been written
+        to the socket. This bypasses the rate limiter.
+        """
+        self._check_started()
+        yield from self.connection.send_coro(self._to_probuf(update))
+
+    def packets(self, batch=None, timeout=None, maxlen=None):
+        """
+        Returns an async iterator over every packet received from now on:
+
+            async for packet in client.packets():
+                ...
+
+        See PacketStream for batch and timeout. maxlen bounds how many
+        unread packets are kept, dropping the oldest.
+        """
+        stream = PacketStream(self, None, batch, timeout, maxlen)
+        self._streams.append(stream)
+        return stream
+
+    def reports(self, batch=None, timeout=None, maxlen=None):
+        """Like packets(), but only yields Reports."""
+        stream = PacketStream(self, proto.id.report, batch, timeout, maxlen)
+        self._streams.append(stream)
+        return stream
+
+    def on_tactile(self, tactile_id, handler=None):
+        """
+        Call handler with the TactileInfo for the given tactile from every
+        report, after on_report. Works as a decorator too:
+
+            @client.on_tactile(3)
+            def jump(info):
+                ...
+        """
+        return self._subscribe('tactile', tactile_id, handler)
+
+    def on_joystick(self, joystick_id, handler=None):
+        """Like on_tactile(), for a joystick's JoystickInfo."""
+        return self._subscribe('joystick', joystick_id, handler)
+
+    def on_screen(self, screen_id, handler=None):
+        """Like on_tactile(), for a screen's ScreenInfo."""
+        return self._subscribe('screen', screen_id, handler)
+
+    def unsubscribe(self, handler):
+        """Stop calling a handler added with on_tactile(), on_joystick() or on_screen()."""
+        for table in self._subscriptions.values():
+            for control_id, handlers in list(table.items()):
+                kept = tuple(h for h in handlers if h[0] is not handler)
+                if not kept:
+                    del table[control_id]
+                elif len(kept) != len(handlers):
+                    table[control_id] = kept
+
+    @asyncio.coroutine
+    def connect(self, loop=None, receive=True):
+        """
+        Connect to Beam on an existing event loop (by default, the one
+        this is awaited from) and handle packets in a background task
+        on it. Unlike start(), this returns once connected, and never
+        touches the global event loop or anyone else's tasks. It does
+        not reconnect; await wait_closed() to find out when the
+        connection drops.
+
+        With receive=False no background task is started, and packets
+        are only read while iterating packets() or reports().
+
+        The client can also be used as `async with client: ...`.
+        """
+        self.loop = loop if loop is not None else asyncio.get_event_loop()
+        self.state = None
+        self._started = False
+        self._num_buttons = None
+        self._templates.clear()
+
+        yield from self._connect()
+        if receive:
+            self._receive_task = self._receiving = self.loop.create_task(self._receive())
+        return self
+
+    @asyncio.coroutine
+    def wait_closed(self):
+        """
+        Wait until a connection made with connect() has closed. If it closed
+        because a handler raised, or because the watchdog timed it out
+        (asyncio.TimeoutError), that exception is raised here.
+        """
+        task = self._receive_task
+        if task is not None:
+            yield from asyncio.wait([task], loop=self.loop)
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+
+    @asyncio.coroutine
+    def close(self):
+        """Close a connection made with connect(), cancelling only the client's own tasks."""
+        self._started = False
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        if self.scheduler is not None:
+            self.scheduler.close()
+            self.scheduler = None
+        if self.cooldowns is not None:
+            self.cooldowns.close()
+        if self._receive_task is not None:
+            self._receive_task.cancel()
+            # Only wait for it to stop - an error it ended with is wait_closed()'s to report
+            yield from asyncio.gather(self._receive_task, loop=self.loop, return_exceptions=True)
+            self._receive_task = None
+        if self._pull_task is not None:
+            self._pull_task.cancel()
+            self._pull_task = None
+        self._finish_streams()
+        self._streams = []
+        if self.connection is not None:
+            self.connection.close()
+            yield from self.connection.wait_closed()
+        if self.capture is not None:
+            # Writes out the index entries the capture was holding back
+            self.capture.flush()
+
+    @asyncio.coroutine
+    def __aenter__(self):
+        return (yield from self.connect())
+
+    @asyncio.coroutine
+    def __aexit__(self, *exc_info):
+        yield from self.close()
+
+    def serve_metrics(self, port=9100, host='127.0.0.1'):
+        """
+        Serves the client's metrics in the Prometheus text format at
+        http://host:port/metrics, from a background thread. Returns the
+        MetricsServer, which can be closed with .close().
+        """
+        return MetricsServer(self.metrics, port, host).start()
+
+    @property
+    def rtt(self):
+        """
+        The last measured websocket round trip time in seconds, or None.
+        Only measured when the client is created with a ping_interval.
+        """
+        return self.watchdog.rtt if self.watchdog is not None else None
+
+    def latency_snapshot(self):
+        """
+        Returns per-packet latency histograms, or None if the client
+        was not created with measure_latency=True.
+        """
+        return self.latency.snapshot() if self.latency is not None else None
 
     def set_state(self, state):
         progress = ProgressUpdate()
@@ -86,50 +340,161 @@ class BeamInteractiveClient:
         self.send(progress)
 
     def tactile_fire(self, tactile_id=None):
-        update_on, update_off = ProgressUpdate(), ProgressUpdate()
+        """
+        Fire and then release the given tactile(s), or every tactile if
+        tactile_id is None. Both updates are written back to back.
+        """
         if tactile_id is None:
-            for i in range(self._num_buttons):
-                update_on.tactile_updates.append(TactileUpdate(id_=i, fired=True))
-                update_off.tactile_updates.append(TactileUpdate(id_=i, fired=False))
-            self.send(update_on)
-            self.send(update_off)
+            self._send_template(('fire', None), lambda: self._fire_updates(range(self._num_buttons)))
             return
 
         try:
-            for id_ in tactile_id:
-                update_on.tactile_updates.append(TactileUpdate(id_=id_, fired=True))
-                update_off.tactile_updates.append(TactileUpdate(id_=id_, fired=False))
+            ids = list(tactile_id)
         except TypeError:
-            self.send(TactileUpdate(id_=tactile_id, fired=True))
-            self.send(TactileUpdate(id_=tactile_id, fired=False))
+            self._send_template(('fire', tactile_id), lambda: self._fire_updates((tactile_id,)))
+            return
+        self._send_updates(self._fire_updates(ids))
 
     def tactile_cooldown(self, length, tactile_id=None):
+        """
+        Put the given tactile(s) on cooldown, or every tactile if tactile_id
+        is None. With track_cooldowns, tactiles that are already cooling
+        down for at least as long are left out.
+        """
+        if self.cooldowns is not None:
+            self._tracked_cooldown(length, tactile_id)
+            return
+
         if tactile_id is None:
-            progress = ProgressUpdate()
-            for i in range(self._num_buttons):
-                progress.tactile_updates.append(TactileUpdate(id_=i, cooldown=length))
-            self.send(progress)
+            self._send_template(('cooldown', length), lambda: self._cooldown_updates(range(self._num_buttons), length))
             return
 
         try:
-            progress = ProgressUpdate()
-            for id_ in tactile_id:
-                progress.tactile_updates.append(TactileUpdate(id_=id_, cooldown=length))
-            self.send(progress)
+            ids = list(tactile_id)
         except TypeError:
             self.send(TactileUpdate(id_=tactile_id, cooldown=length))
+            return
+        self._send_updates(self._cooldown_updates(ids, length))
+
+    def cooldown_remaining(self, tactile_id):
+        """
+        Returns the seconds left on a tactile's cooldown, as far as the
+        client knows. Needs track_cooldowns.
+        """
+        if self.cooldowns is None:
+            raise ValueError("The client isn't tracking cooldowns - pass track_cooldowns=True")
+        return self.cooldowns.remaining(tactile_id)
 
     # <editor-fold desc="Private Functions">
 
+    def _tracked_cooldown(self, length, tactile_id):
+        """tactile_cooldown() with the tracker filtering out redundant cooldowns."""
+        self._check_started()
+        if threading.get_ident() != self._loop_thread:
+            # The tracker belongs to the loop, so do the bookkeeping there
+            self.loop.call_soon_threadsafe(self._tracked_cooldown, length, tactile_id)
+            return
+
+        if tactile_id is None:
+            ids = range(self._num_buttons)
+        else:
+            try:
+                ids = list(tactile_id)
+            except TypeError:
+                ids = (tactile_id,)
+
+        needed = self.cooldowns.start(ids, length)
+        if not needed:
+            return
+        if tactile_id is None and len(needed) == self._num_buttons:
+            self._send_template(('cooldown', length), lambda: self._cooldown_updates(range(self._num_buttons), length))
+        else:
+            self._send_updates(self._cooldown_updates(needed, length))
+
+    def _subscribe(self, kind, control_id, handler):
+        if handler is None:
+            return lambda handler: self._subscribe(kind, control_id, handler)
+        table = self._subscriptions[kind]
+        # Replaced rather than appended to, so a dispatch in progress isn't affected
+        table[control_id] = table.get(control_id, ()) + ((handler, asyncio.coroutine(handler)),)
+        return handler
+
+    @asyncio.coroutine
+    def _dispatch_controls(self, report):
+        """Calls the subscribed handlers for a report's controls, in one pass over each list."""
+        for kind, controls in (('tactile', report.tactile), ('joystick', report.joystick),
+                               ('screen', report.screen)):
+            table = self._subscriptions[kind]
+            if not table:
+                continue
+            for control in controls:
+                handlers = table.get(control.id)
+                if handlers is not None:
+                    for _, handler in handlers:
+                        yield from handler(control)
+
+    def _start_cooldowns(self):
+        """Sets up cooldown tracking for a new connection. Called on the loop's thread."""
+        if self.cooldowns is not None:
+            self.cooldowns.close()
+        if self._track_cooldowns:
+            self.cooldowns = CooldownTracker(self.loop, self._cooldowns_ended)
+        self._loop_thread = threading.get_ident()
+
+    def _cooldowns_ended(self, tactile_ids):
+        """Runs on_cooldown_end for tactiles whose cooldowns just ran out, in its own task."""
+        self.loop.create_task(self._on_cooldown_end(tactile_ids))
+
     @asyncio.coroutine
     def _run(self, delay=None):
         if delay is not None:
             print("Couldn't connect to Beam - trying again in 5 seconds...")
             yield from asyncio.sleep(delay)
+        yield from self._connect()
+        yield from self._receive()
+
+    @asyncio.coroutine
+    def _connect(self):
+        """
+        Look up the robot through the REST API, then open the connection to
+        it. With fast_start and a known robot, the connection is opened while
+        the API is still being asked, and thrown away if the API disagrees.
+        """
+        self._connect_started = time.perf_counter()
+        if self._debug:
+            print("Using the {} protobuf backend.".format(proto.backend()))
+        if self._fast_start and self.robot is not None:
+            self.connection = yield from self._connect_fast()
+        else:
+            yield from self._look_up_robot()
+            self.connection = yield from self._open()  # type: connection
+        self.robot = (self.channel_id, self.data["address"], self.data["key"])
+        self.watchdog = Watchdog(self.connection, self._timeout, self._ping_interval, self.metrics).start()
+        if self.scheduler is not None:
+            self.scheduler.close()
+        if self._rate_limit is not None:
+            self.scheduler = OutboundScheduler(self, self._rate_limit, self._burst)
+        elif self._tick_rate is not None:
+            self.scheduler = TickScheduler(self, self._tick_rate)
+        if self.differ is not None:
+            self.differ.reset()
+        self._start_cooldowns()
+        self._started = True
+
+    @asyncio.coroutine
+    def _look_up_robot(self, channel_id=None):
+        """
+        Fetch the channel id and the robot's address and key from the REST
+        API. If a channel id is predicted, both requests are made at once and
+        the robot is only asked for again if the prediction was wrong.
+        """
+        joining = None
+        if channel_id is not None:
+            joining = self.loop.run_in_executor(None, self._join_interactive, channel_id)
         try:
             if self._debug:
                 print("Getting user data...")
-            self.user_data = self._get_user_data()  # type: dict
+            self.user_data = yield from self.loop.run_in_executor(None, self._get_user_data)  # type: dict
             if self._debug:
                 print("Retrieved.")
         except (KeyError, TypeError):
@@ -144,22 +509,163 @@ class BeamInteractiveClient:
 
         if self._debug:
             print("Getting interactive connection info...")
-        self.data = self._join_interactive()  # type: dict
+        if joining is not None and self.channel_id == channel_id:
+            self.data = yield from joining  # type: dict
+        else:
+            if joining is not None:
+                joining.cancel()
+            self.data = yield from self.loop.run_in_executor(None, self._join_interactive)  # type: dict
         if self._debug:
             print("Retrieved.")
-        self.connection = \
-            yield from start(self.data["address"], self.channel_id, self.data["key"], self.loop)  # type: connection
-        self._started = True
-        while (yield from asyncio.wait_for(self.connection.wait_message(), self._timeout)):
-            yield from self._handle_packet(self.connection.get_packet())
+
+    @asyncio.coroutine
+    def _open(self, channel_id=None, address=None, key=None, socket=None):
+        """Open the connection to the robot, or use socket if it is open already, and send the Handshake."""
+        return (yield from start(address or self.data["address"],
+                                 self.channel_id if channel_id is None else channel_id,
+                                 key or self.data["key"], self.loop,
+                                 latency=self.latency, metrics=self.metrics, capture=self.capture,
+                                 compression=self._compression, socket=socket))
+
+    @asyncio.coroutine
+    def _connect_fast(self):
+        """
+        Open the socket to the predicted robot and look the robot up at the
+        same time. If the API comes back with a different robot, or the
+        speculative connection failed, connect again the normal way.
+
+        Only the socket is opened early. The Handshake, and with it the
+        capture and the connection's metrics, wait until the API agrees.
+        """
+        channel_id, address, key = self.robot
+        opening = asyncio.ensure_future(open_socket(address, self.loop, self._compression), loop=self.loop)
+        try:
+            yield from self._look_up_robot(channel_id)
+        except BaseException:
+            yield from self._discard(opening)
+            raise
+
+        if (self.channel_id, self.data["address"], self.data["key"]) == self.robot:
+            conn = None
+            try:
+                socket = yield from opening
+                # The robot may have hung up while the API was asked; don't
+                # handshake, capture or count anything on a dead socket
+                if socket.open:
+                    conn = yield from self._open(channel_id, address, key, socket=socket)
+            except (OSError, websockets.exceptions.InvalidHandshake, websockets.exceptions.ConnectionClosed):
+                pass
+            if conn is not None:
+                self._fast_start_hits.inc()
+                return conn
+            if self._debug:
+                print("Fast start couldn't reach the robot, connecting again...")
+        else:
+            if self._debug:
+                print("Robot has changed, connecting again...")
+            yield from self._discard(opening)
+
+        self._fast_start_misses.inc()
+        return (yield from self._open())
+
+    @asyncio.coroutine
+    def _discard(self, opening):
+        """Cancel a speculative socket, closing it if it already opened."""
+        if not opening.done():
+            opening.cancel()
+        try:
+            socket = yield from opening
+        except (asyncio.CancelledError, Exception):
+            return
+        yield from socket.close()
+
+    @asyncio.coroutine
+    def _receive(self):
+        """
+        Handle incoming packets until the connection closes. Raises
+        asyncio.TimeoutError if it was closed by the watchdog. If a handler
+        raises, the connection is closed, so nothing is left reading into
+        a queue that no one drains.
+        """
+        self._receiving = asyncio.Task.current_task(loop=self.loop)
+        try:
+            while True:
+                if self._pull_task is not None and not self._pull_task.done():
+                    # A stream iterated from inside a handler may have left a read going
+                    yield from asyncio.wait([self._pull_task], loop=self.loop)
+                if not (yield from self.connection.wait_message()):
+                    break
+                packet = self.connection.get_packet()
+                yield from self._handle_packet(packet)
+                self.connection.packet_handled(packet)
+        finally:
+            self._receiving = None
+            if self.watchdog is not None:
+                self.watchdog.stop()
+            self.connection.close()
+            self._finish_streams()
+
+        if self.watchdog is not None and self.watchdog.timed_out:
+            raise asyncio.TimeoutError()
+
+    def _pull(self):
+        """
+        Returns a task that reads and handles the next packet, for streams
+        to wait on when nothing is reading in the background, or when the
+        background reader is the one waiting, in a handler. Streams share
+        the task, so there is only ever one wait_message() at a time.
+        """
+        if self._pull_task is None or self._pull_task.done():
+            self._pull_task = self.loop.create_task(self._receive_one())
+        return self._pull_task
+
+    @asyncio.coroutine
+    def _receive_one(self):
+        if not (yield from self.connection.wait_message()):
+            if self.watchdog is not None:
+                self.watchdog.stop()
+            self._finish_streams()
+            return
+        packet = self.connection.get_packet()
+        yield from self._handle_packet(packet)
+        self.connection.packet_handled(packet)
+
+    def _finish_streams(self):
+        for stream in self._streams:
+            stream._finish()
 
     @asyncio.coroutine
     def _handle_packet(self, packet):
+        if not profiling.hooks:
+            return (yield from self._dispatch(packet))
+
+        packet_type = proto.id.get_packet_name(proto.id.get_packet_id(packet[0]))
+        tokens = profiling.begin('dispatch', packet_type)
+        try:
+            return (yield from self._dispatch(packet))
+        finally:
+            profiling.end('dispatch', packet_type, tokens)
+
+    @asyncio.coroutine
+    def _dispatch(self, packet):
         decoded, _ = packet
         packet_id = proto.id.get_packet_id(decoded)
 
         if packet_id == proto.id.report:
-            self._num_buttons = len(decoded.tactile)
+            num_buttons = len(decoded.tactile)
+            if num_buttons != self._num_buttons:
+                if self.cooldowns is not None and self._num_buttons is not None:
+                    # The board has changed, so the old ids mean nothing now
+                    self.cooldowns.cancel()
+                self._num_buttons = num_buttons
+                self._templates.clear()
+        elif packet_id == proto.id.handshake_ack and self._connect_started is not None:
+            self._handshake_time.set(time.perf_counter() - self._connect_started)
+            self._connect_started = None
+
+        if self._streams and decoded is not None:
+            for stream in self._streams:
+                stream._offer(packet_id, decoded)
 
         if packet_id in self._handlers:
             yield from self._handlers[packet_id](decoded)
@@ -168,21 +674,130 @@ class BeamInteractiveClient:
         else:
             print("We got packet {} but didn't handle it!".format(packet_id))
 
+        if packet_id == proto.id.report:
+            if self.audience is not None:
+                self.audience.update(decoded)
+            subscriptions = self._subscriptions
+            if subscriptions['tactile'] or subscriptions['joystick'] or subscriptions['screen']:
+                yield from self._dispatch_controls(decoded)
+            if self.differ is not None:
+                changes = self.differ.diff(decoded)
+                if changes:
+                    yield from self._on_changes(changes)
+
     # <editor-fold desc="helper functions">
     def _get_user_data(self):
         """Log into Beam via the API."""
         return requests.get(self._build("/users/current"),
                             headers={"Authorization": ("Bearer " + self._oauth)}).json()
 
-    @staticmethod
-    def _build(endpoint):
+    def _build(self, endpoint):
         """Build an address for an API endpoint."""
-        return urljoin(URL, endpoint.lstrip('/'))
+        return urljoin(self._api_url, endpoint.lstrip('/'))
 
-    def _join_interactive(self):
+    def _join_interactive(self, channel_id=None):
         """Retrieve interactive connection information."""
         return requests.get(self._build("/interactive/{channel}/robot").format(
-            channel=self.channel_id), headers={"Authorization": ("Bearer " + self._oauth)}).json()
+            channel=self.channel_id if channel_id is None else channel_id), headers={"Authorization": ("Bearer " + self._oauth)}).json()
+
+    def _attach(self, loop, connection):
+        """
+        Wires the client straight to an existing connection, skipping the
+        REST calls and the handshake. Used for replays and benchmarks.
+        """
+        self.loop = loop
+        self.state = None
+        self._num_buttons = None
+        self._templates.clear()
+        self.connection = connection
+        self.watchdog = None
+        if self.differ is not None:
+            self.differ.reset()
+        self._start_cooldowns()
+        self._started = True
+
+    def _to_probuf(self, update):
+        """Convert anything send() accepts to a protobuf ProgressUpdate."""
+        return self._to_progress(update).to_probuf()
+
+    def _encode_cached(self, update):
+        """
+        Returns the wire bytes for an update, from the packet cache if an
+        update with the same content has been sent recently.
+        """
+        key = cache_key(update)
+        entry = self.packet_cache.get(key) if key is not None else None
+        if entry is None:
+            progress = self._to_progress(update)
+            data = proto.encode(progress.to_probuf())
+            if key is not None:
+                self.packet_cache.put(key, data, progress.state)
+            return data
+
+        data, state = entry
+        if state is not None:
+            self.state = state
+        return data
+
+    def _to_progress(self, update, track_state=True):
+        """Convert anything send() accepts to a ProgressUpdate."""
+        if isinstance(update, ProgressUpdate):
+            progress = update
+        elif isinstance(update, (JoystickUpdate, TactileUpdate, ScreenUpdate)):
+            progress = update.wrap()
+        elif isinstance(update, dict):
+            progress = ProgressUpdate.from_dict(update)
+        elif isinstance(update, str):
+            progress = ProgressUpdate.from_json(update)
+        else:
+            raise ValueError("Invalid data type - must be a ProgressUpdate, TactileUpdate, ScreenUpdate, dict or str.")
+
+        if track_state and progress.state is not None:
+            self.state = progress.state
+        return progress
+
+    @staticmethod
+    def _fire_updates(ids):
+        update_on, update_off = ProgressUpdate(), ProgressUpdate()
+        for id_ in ids:
+            update_on.tactile_updates.append(TactileUpdate(id_=id_, fired=True))
+            update_off.tactile_updates.append(TactileUpdate(id_=id_, fired=False))
+        return update_on, update_off
+
+    @staticmethod
+    def _cooldown_updates(ids, length):
+        progress = ProgressUpdate()
+        for id_ in ids:
+            progress.tactile_updates.append(TactileUpdate(id_=id_, cooldown=length))
+        return progress,
+
+    def _send_updates(self, updates):
+        """Send several updates, written back to back when not rate limited."""
+        self._check_started()
+        if self.scheduler is not None:
+            for update in updates:
+                self.send(update)
+        else:
+            self.connection.send_encoded(*(proto.encode(update.to_probuf()) for update in updates))
+
+    def _send_template(self, key, build):
+        """
+        Send the updates made by build(), reusing their encoded bytes from
+        the last time the same key was sent. Templates are thrown away
+        whenever the number of buttons changes.
+        """
+        self._check_started()
+        if self.scheduler is not None:
+            for update in build():
+                self.send(update)
+            return
+
+        frames = self._templates.get(key)
+        if frames is None:
+            if len(self._templates) >= _MAX_TEMPLATES:
+                self._templates.clear()
+            frames = self._templates[key] = tuple(proto.encode(update.to_probuf()) for update in build())
+        self.connection.send_encoded(*frames)
 
     def _check_started(self):
         if not self._started:
@@ -0,0 +1,104 @@
+"""
+Turns the joysticks in a Report into angle and intensity feedback for
+every joystick at once, with NumPy. NumPy is only needed if you use this
+module.
+"""
+
+from itertools import chain
+
+import numpy as np
+
+from beam_interactive_unofficial.beam_interactive_modified import proto
+from beam_interactive_unofficial.progress_update import ProgressUpdate, JoystickUpdate
+
+TWO_PI = 2 * np.pi
+
+
+def report_arrays(report):
+    """
+    Returns (ids, means, stddevs) for a Report's joysticks: an (N,) int
+    array of ids and two (N, 2) float arrays of x, y pairs.
+    """
+    joysticks = report.joystick
+    n = len(joysticks)
+    ids = np.fromiter((joystick.id for joystick in joysticks), dtype=np.int64, count=n)
+    coords = np.fromiter(chain.from_iterable(
+        (joystick.coordMean.x, joystick.coordMean.y, joystick.coordStddev.x, joystick.coordStddev.y)
+        for joystick in joysticks), dtype=np.float64, count=4 * n).reshape(n, 4)
+    return ids, coords[:, :2], coords[:, 2:]
+
+
+def angles_and_intensities(means, stddevs=None, spread_penalty=0.0, deadzone=0.0, max_intensity=1.0):
+    """
+    Converts (N, 2) mean coordinates to (N,) angles in [0, 2π] and
+    intensities in [0, max_intensity].
+
+    With a spread_penalty, intensity is divided by 1 + spread_penalty
+    times the length of the stddev, so a crowd pulling in different
+    directions moves the joystick less than one that agrees. Intensities
+    below deadzone become 0.
+    """
+    x, y = means[:, 0], means[:, 1]
+    angles = np.arctan2(y, x)
+    angles[angles < 0] += TWO_PI
+    intensities = np.hypot(x, y)
+    if stddevs is not None and spread_penalty:
+        intensities /= 1 + spread_penalty * np.hypot(stddevs[:, 0], stddevs[:, 1])
+    if deadzone:
+        intensities[intensities < deadzone] = 0
+    np.clip(intensities, 0, max_intensity, out=intensities)
+    return angles, intensities
+
+
+class JoystickPipeline:
+    """
+    Builds the joystick part of a progress update straight from a
+    Report: the coordinates are pulled into arrays, converted with
+    angles_and_intensities(), and written into a protobuf ProgressUpdate
+    in one pass. The arrays are in range by construction, so the
+    per-update check() that JoystickUpdate would do is skipped. A client
+    with a rate_limit or tick_rate has to convert it back before it can
+    schedule it, so use progress() with those instead.
+
+        pipeline = JoystickPipeline(deadzone=0.1)
+
+        def on_report(report):
+            client.send(pipeline.build(report))
+    """
+
+    def __init__(self, spread_penalty=0.0, deadzone=0.0, max_intensity=1.0):
+        self.spread_penalty = spread_penalty
+        self.deadzone = deadzone
+        self.max_intensity = max_intensity
+
+    def compute(self, report):
+        """Returns (ids, angles, intensities) arrays for a Report's joysticks."""
+        ids, means, stddevs = report_arrays(report)
+        angles, intensities = angles_and_intensities(means, stddevs, self.spread_penalty, self.deadzone,
+                                                     self.max_intensity)
+        return ids, angles, intensities
+
+    def build(self, report, progress=None) -> proto.ProgressUpdate:
+        """
+        Returns a protobuf ProgressUpdate with a joystick update for each
+        joystick in the report, or adds them to the one given.
+        """
+        if progress is None:
+            progress = proto.ProgressUpdate()
+        ids, angles, intensities = self.compute(report)
+        add = progress.joystick.add
+        for joystick_id, angle, intensity in zip(ids.tolist(), angles.tolist(), intensities.tolist()):
+            joystick = add()
+            joystick.id = joystick_id
+            joystick.angle = angle
+            joystick.intensity = intensity
+        return progress
+
+    def progress(self, report) -> ProgressUpdate:
+        """Like build(), but returns a ProgressUpdate, e.g. to merge with other updates."""
+        update = ProgressUpdate()
+        ids, angles, intensities = self.compute(report)
+        update.joystick_updates = [JoystickUpdate(id_=joystick_id, angle=angle, intensity=intensity)
+                                   for joystick_id, angle, intensity in
+                                   zip(ids.tolist(), angles.tolist(), intensities.tolist())]
+        return update
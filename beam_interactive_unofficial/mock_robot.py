@@ -0,0 +1,279 @@
+"""
+A local stand-in for Beam, for load and latency testing without a live
+channel. MockRobotServer speaks the Tetris robot protocol over a
+websocket and MockBeamAPI answers the two REST calls the client makes
+before connecting.
+
+From the command line:
+
+    python -m beam_interactive_unofficial.mock_robot --rate 20 --tactiles 50
+
+and point a client at it with BeamInteractiveClient(..., api_url=<printed url>).
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
+
+import websockets
+from websockets.exceptions import ConnectionClosed
+
+from beam_interactive_unofficial.beam_interactive_modified import proto
+
+
+class MockRobotServer:
+    """
+    A websocket server that behaves like the Tetris robot. It checks the
+    Handshake (against channel and key, if given), replies with a
+    HandshakeACK, then sends a synthetic Report `report_rate` times a
+    second while recording every ProgressUpdate it receives.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, channel=None, key=None, report_rate=10.0,
+                 tactiles=10, joysticks=0, screens=0, users=100, seed=None, loop=None):
+        self.host, self.port = host, port
+        self.channel, self.key = channel, key
+        self.report_rate = report_rate
+        self.tactiles, self.joysticks, self.screens, self.users = tactiles, joysticks, screens, users
+
+        self._loop = loop
+        self._random = random.Random(seed)
+        self._server = None
+        self._time = 0
+
+        self.handshakes = []  # type: list
+        self.received = []  # type: list
+        self.reports_sent = 0
+
+    @asyncio.coroutine
+    def start(self):
+        """Starts listening. The real port is available once this returns."""
+        if self._loop is None:
+            self._loop = asyncio.get_event_loop()
+
+        self._server = yield from websockets.serve(self._handle, self.host, self.port, loop=self._loop)
+        sockets = getattr(self._server, 'sockets', None) or self._server.server.sockets
+        self.port = sockets[0].getsockname()[1]
+        return self
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+
+    @asyncio.coroutine
+    def wait_closed(self):
+        if self._server is not None:
+            yield from self._server.wait_closed()
+
+    @property
+    def address(self):
+        """The address to hand to the client, without the /robot suffix."""
+        return "ws://{}:{}".format(self.host, self.port)
+
+    def make_report(self):
+        """Builds the next synthetic Report."""
+        rand = self._random
+        self._time += 1
+
+        report = proto.Report()
+        report.time = self._time
+        report.users.connected = self.users
+        report.users.quorum = self.users // 2
+        report.users.active = rand.randint(0, self.users)
+        for i in range(5):
+            bucket = report.users.qgram.add()
+            bucket.x = i
+            bucket.y = rand.randint(0, self.users)
+
+        for i in range(self.tactiles):
+            tactile = report.tactile.add()
+            tactile.id = i
+            tactile.holding = rand.randint(0, 3)
+            tactile.pressFrequency = rand.randint(0, 3)
+            tactile.releaseFrequency = rand.randint(0, 3)
+
+        for i in range(self.joysticks):
+            joystick = report.joystick.add()
+            joystick.id = i
+            joystick.coordMean.x, joystick.coordMean.y = rand.uniform(-1, 1), rand.uniform(-1, 1)
+            joystick.coordStddev.x, joystick.coordStddev.y = rand.random(), rand.random()
+
+        for i in range(self.screens):
+            screen = report.screen.add()
+            screen.id = i
+            screen.clicks = rand.randint(0, 10)
+            screen.coordMean.x, screen.coordMean.y = rand.random(), rand.random()
+            screen.coordStddev.x, screen.coordStddev.y = rand.random(), rand.random()
+
+        return report
+
+    @asyncio.coroutine
+    def _send_error(self, socket, message):
+        error = proto.Error()
+        error.message = message
+        yield from socket.send(proto.encode(error))
+
+    @asyncio.coroutine
+    def _handshake(self, socket):
+        """Reads and validates the Handshake. Returns True if it was accepted."""
+        try:
+            packet = proto.decode((yield from socket.recv()))
+        except Exception:
+            packet = None
+
+        if not isinstance(packet, proto.Handshake):
+            yield from self._send_error(socket, "Expected a handshake")
+            return False
+        if (self.channel is not None and packet.channel != self.channel) or \
+                (self.key is not None and packet.streamKey != self.key):
+            yield from self._send_error(socket, "Invalid channel or stream key")
+            return False
+
+        self.handshakes.append((time.monotonic(), packet))
+        yield from socket.send(proto.encode(proto.HandshakeACK()))
+        return True
+
+    @asyncio.coroutine
+    def _send_reports(self, socket):
+        if not self.report_rate:
+            return
+        interval = 1 / self.report_rate
+        deadline = self._loop.time()
+        while True:
+            yield from socket.send(proto.encode(self.make_report()))
+            self.reports_sent += 1
+            deadline += interval
+            yield from asyncio.sleep(max(0, deadline - self._loop.time()), loop=self._loop)
+
+    @asyncio.coroutine
+    def _handle(self, socket, path):
+        if path != "/robot":
+            yield from self._send_error(socket, "Unknown path {}".format(path))
+            return
+
+        try:
+            if not (yield from self._handshake(socket)):
+                return
+        except ConnectionClosed:
+            return
+
+        reporter = self._loop.create_task(self._send_reports(socket))
+        try:
+            while True:
+                data = yield from socket.recv()
+                packet = proto.decode(data)
+                if isinstance(packet, proto.ProgressUpdate):
+                    self.received.append((time.monotonic(), packet))
+                else:
+                    yield from self._send_error(socket, "Unexpected packet")
+        except ConnectionClosed:
+            pass
+        finally:
+            reporter.cancel()
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class MockBeamAPI:
+    """
+    Answers GET /users/current and GET /interactive/{channel}/robot the
+    way the Beam API does, pointing the client at a MockRobotServer. The
+    server runs on a daemon thread. Each request waits delay seconds
+    before it is answered, to stand in for a round trip to the real API.
+    """
+
+    def __init__(self, robot_address, channel=1, key='mock-key', oauth=None, host='127.0.0.1', port=0, delay=0):
+        self.robot_address = robot_address
+        self.channel, self.key, self.oauth = channel, key, oauth
+        self.delay = delay
+        self._server = _ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        """The value to pass as the client's api_url."""
+        host, port = self._server.server_address[:2]
+        return "http://{}:{}/api/v1/".format(host, port)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _make_handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if api.delay:
+                    time.sleep(api.delay)
+                if api.oauth is not None and self.headers.get("Authorization") != "Bearer " + api.oauth:
+                    return self._reply(401, {"message": "You must be authenticated to do this."})
+
+                if self.path == "/api/v1/users/current":
+                    return self._reply(200, {"channel": {"id": api.channel}})
+                if self.path == "/api/v1/interactive/{}/robot".format(api.channel):
+                    return self._reply(200, {"address": api.robot_address, "key": api.key})
+                return self._reply(404, {"message": "Not found."})
+
+            def _reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m beam_interactive_unofficial.mock_robot')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0, help='robot websocket port (default: any free port)')
+    parser.add_argument('--api-port', type=int, default=0, help='REST stub port (default: any free port)')
+    parser.add_argument('--channel', type=int, default=1)
+    parser.add_argument('--key', default='mock-key')
+    parser.add_argument('--oauth', help='only accept this OAuth token')
+    parser.add_argument('--rate', type=float, default=10.0, help='reports per second')
+    parser.add_argument('--tactiles', type=int, default=10)
+    parser.add_argument('--joysticks', type=int, default=0)
+    parser.add_argument('--screens', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    loop = asyncio.get_event_loop()
+    robot = MockRobotServer(args.host, args.port, channel=args.channel, key=args.key, report_rate=args.rate,
+                            tactiles=args.tactiles, joysticks=args.joysticks, screens=args.screens, loop=loop)
+    loop.run_until_complete(robot.start())
+    api = MockBeamAPI(robot.address, channel=args.channel, key=args.key, oauth=args.oauth,
+                      host=args.host, port=args.api_port).start()
+
+    print("Robot listening on {}/robot".format(robot.address))
+    print("API stub listening on {}".format(api.url))
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("Received {} progress updates.".format(len(robot.received)))
+        api.close()
+        robot.close()
+        loop.run_until_complete(robot.wait_closed())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import threading
+from collections import OrderedDict
+
+from beam_interactive_unofficial.progress_update import ProgressUpdate, TactileUpdate, JoystickUpdate, ScreenUpdate
+
+
+def _freeze(value):
+    """Turns dicts and lists into hashable tuples, recursively."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if hasattr(value, 'tobytes'):
+        # NumPy arrays, such as ScreenUpdate clicks
+        return 'array', value.shape, str(value.dtype), value.tobytes()
+    return value
+
+
+def _control_key(control):
+    return type(control).__name__, tuple(_freeze(v) for v in vars(control).values())
+
+
+def cache_key(update):
+    """
+    Returns a hashable key for the content of anything send() accepts, so
+    that two updates with the same content get the same key. Returns None
+    for things that can't be sent.
+    """
+    if isinstance(update, ProgressUpdate):
+        return ('progress', update.state,
+                tuple(_control_key(c) for c in update.tactile_updates),
+                tuple(_control_key(c) for c in update.joystick_updates),
+                tuple(_control_key(c) for c in update.screen_updates))
+    if isinstance(update, (TactileUpdate, JoystickUpdate, ScreenUpdate)):
+        return _control_key(update)
+    if isinstance(update, str):
+        return 'json', update
+    if isinstance(update, dict):
+        return 'dict', _freeze(update)
+    return None
+
+
+class PacketCache:
+    """
+    An LRU cache from update content (see cache_key) to the encoded
+    bytes that go on the wire, along with the update's state so the
+    client can keep track of it.
+
+    send() can be called from any thread, so every lookup and insert is
+    made under a lock.
+    """
+
+    def __init__(self, maxsize=256, metrics=None):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+        if metrics is not None:
+            metrics.gauge_function('packet_cache_hits', lambda: self.hits, "Sends served from the packet cache")
+            metrics.gauge_function('packet_cache_misses', lambda: self.misses, "Sends that had to be encoded")
+            metrics.gauge_function('packet_cache_size', lambda: len(self._entries), "Entries in the packet cache")
+
+    def get(self, key):
+        """Returns (data, state) for a key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, data, state):
+        with self._lock:
+            self._entries[key] = (data, state)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            hits, misses, evictions, size = self.hits, self.misses, self.evictions, len(self._entries)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'evictions': evictions,
+            'hit_rate': hits / total if total else None,
+            'size': size,
+        }
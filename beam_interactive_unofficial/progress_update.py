@@ -5,7 +5,7 @@ from math import pi
 from typing import List
 from json import loads as load_json
 
-from beam_interactive_unofficial.beam_interactive_modified import proto
+from beam_interactive_unofficial.beam_interactive_modified import proto, profiling
 
 
 # <editor-fold desc="Helper Functions">
@@ -25,6 +25,11 @@ def _accepts(*types, none_accepted=True):
     return check_accepts
 
 
+def _field(message, name):
+    """A protobuf field's value, or None if it isn't set."""
+    return getattr(message, name) if message.HasField(name) else None
+
+
 # </editor-fold>
 
 
@@ -36,7 +41,18 @@ class ProgressUpdate:
         self.screen_updates = []  # type: List[ScreenUpdate]
 
     # noinspection SpellCheckingInspection
-    def to_probuf(self) -> proto.ProgressUpdate:
+    def to_probuf(self) -> 'proto.ProgressUpdate':
+        if not profiling.hooks:
+            return self._to_probuf()
+
+        tokens = profiling.begin('to_probuf', 'progress_update')
+        try:
+            return self._to_probuf()
+        finally:
+            profiling.end('to_probuf', 'progress_update', tokens)
+
+    # noinspection SpellCheckingInspection
+    def _to_probuf(self) -> 'proto.ProgressUpdate':
         self._check_vars()
         progress = proto.ProgressUpdate()
         if self.state is not None:
@@ -63,7 +79,7 @@ class ProgressUpdate:
             joystick.id = joystick_update.id
 
             if joystick_update.angle is not None:
-                joystick.id = joystick_update.angle
+                joystick.angle = joystick_update.angle
 
             if joystick_update.intensity is not None:
                 joystick.intensity = joystick_update.intensity
@@ -75,11 +91,19 @@ class ProgressUpdate:
             screen = progress.screen.add()
             screen.id = screen_update.id
 
-            for click_dict in screen_update.clicks:
-                click = screen.clicks.add()
-                click.intensity = click_dict["intensity"]
-                click.coordinate.x = click_dict["coordinate"]["x"]
-                click.coordinate.y = click_dict["coordinate"]["y"]
+            if hasattr(screen_update.clicks, "shape"):
+                # An (N, 3) array of x, y, intensity rows
+                for x, y, intensity in screen_update.clicks.tolist():
+                    click = screen.clicks.add()
+                    click.intensity = intensity
+                    click.coordinate.x = x
+                    click.coordinate.y = y
+            else:
+                for click_dict in screen_update.clicks:
+                    click = screen.clicks.add()
+                    click.intensity = click_dict["intensity"]
+                    click.coordinate.x = click_dict["coordinate"]["x"]
+                    click.coordinate.y = click_dict["coordinate"]["y"]
 
             if screen_update.disabled is not None:
                 screen.disabled = screen_update.disabled
@@ -110,6 +134,27 @@ class ProgressUpdate:
     def from_json(cls, json: str):
         return cls.from_dict(load_json(json))
 
+    # noinspection SpellCheckingInspection
+    @classmethod
+    def from_probuf(cls, packet: 'proto.ProgressUpdate'):
+        """The reverse of to_probuf(), for updates that were built as protobuf."""
+        update = cls()
+        update.state = _field(packet, 'state')
+        for tactile in packet.tactile:
+            update.tactile_updates.append(TactileUpdate(
+                tactile.id, _field(tactile, 'cooldown'), _field(tactile, 'fired'),
+                _field(tactile, 'progress'), _field(tactile, 'disabled')))
+        for joystick in packet.joystick:
+            update.joystick_updates.append(JoystickUpdate(
+                joystick.id, _field(joystick, 'angle'), _field(joystick, 'intensity'),
+                _field(joystick, 'disabled')))
+        for screen in packet.screen:
+            clicks = [{"intensity": click.intensity, "coordinate": {"x": click.coordinate.x, "y": click.coordinate.y}}
+                      for click in screen.clicks]
+            update.screen_updates.append(ScreenUpdate(screen.id, clicks, _field(screen, 'disabled')))
+
+        return update
+
     def _check_vars(self):
         assert isinstance(self.state, str) or self.state is None, \
             "'state' of ProgressUpdate must be of type 'str'"
@@ -217,6 +262,8 @@ class JoystickUpdate:
         if "disabled" in data:
             joystick.disabled = bool(data["disabled"])
 
+        return joystick
+
     @classmethod
     def from_json(cls, json: str):
         return cls.from_dict(load_json(json))
@@ -230,6 +277,9 @@ class JoystickUpdate:
 class ScreenUpdate:
     def __init__(self, id_=None, clicks=None, disabled=None):
         self.id = id_
+        # Either a sequence of {"intensity", "coordinate": {"x", "y"}} dicts, or
+        # an (N, 3) float array of x, y, intensity rows, like the ones
+        # ScreenHeatmap makes, which is written out without any conversion.
         self.clicks = clicks  # type: List[dict]
         self.disabled = disabled
 
@@ -241,10 +291,15 @@ class ScreenUpdate:
         assert self.id >= 0, \
             "'id' of ScreenUpdate must be of type 'int' and be 0 or greater"
 
-        for click in self.clicks:
-            click["intensity"] = float(click["intensity"])
-            click["coordinate"]["x"] = float(click["coordinate"]["x"])
-            click["coordinate"]["y"] = float(click["coordinate"]["y"])
+        shape = getattr(self.clicks, "shape", None)
+        if shape is not None:
+            assert len(shape) == 2 and shape[1] == 3, \
+                "'clicks' of ScreenUpdate must be a sequence of dicts or an (N, 3) array"
+        else:
+            for click in self.clicks:
+                click["intensity"] = float(click["intensity"])
+                click["coordinate"]["x"] = float(click["coordinate"]["x"])
+                click["coordinate"]["y"] = float(click["coordinate"]["y"])
 
         self.disabled = bool(self.disabled) if self.disabled is not None else None
 
@@ -256,6 +311,8 @@ class ScreenUpdate:
         if "clicks" in data:
             screen.clicks = data["clicks"]
 
+        return screen
+
     @classmethod
     def from_json(cls, json: str):
         return cls.from_dict(load_json(json))
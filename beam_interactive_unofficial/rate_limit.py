@@ -0,0 +1,327 @@
+import collections
+import copy
+import threading
+
+from beam_interactive_unofficial.progress_update import ProgressUpdate
+from beam_interactive_unofficial.beam_interactive_modified.latency import Histogram
+
+CLASSES = ('critical', 'normal', 'cosmetic')
+
+
+class TokenBucket:
+    """
+    A token bucket holding up to `burst` tokens, refilled at `rate`
+    tokens per second. `clock` is any monotonic time function.
+    """
+
+    def __init__(self, rate, burst, clock):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = burst
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def take(self):
+        """Takes a token if one is available. Returns whether it did."""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def wait_time(self):
+        """Seconds until the next token will be available."""
+        self._refill()
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+
+def classify(update: ProgressUpdate):
+    """
+    Works out the priority class of an update from its fields. State
+    changes, and cooldown, fired and disabled changes on any control,
+    are critical. Everything else (progress bars, joystick angle and
+    intensity, screen clicks) is cosmetic.
+    """
+    if update.state is not None:
+        return 'critical'
+    for tactile in update.tactile_updates:
+        if tactile.cooldown is not None or tactile.fired is not None or tactile.disabled is not None:
+            return 'critical'
+    for control in update.joystick_updates + update.screen_updates:
+        if control.disabled is not None:
+            return 'critical'
+    return 'cosmetic'
+
+
+class _Coalesced:
+    """
+    A cosmetic update in waiting. Later updates to the same control
+    are merged in, field by field, instead of being queued behind it.
+    """
+
+    def __init__(self):
+        self.state = None
+        self.controls = collections.OrderedDict()  # (kind, id) -> update
+
+    def merge(self, update):
+        """Merges an update in. Returns how many controls were coalesced."""
+        coalesced = 0
+        if update.state is not None:
+            self.state = update.state
+        for kind, controls in (('tactile', update.tactile_updates), ('joystick', update.joystick_updates),
+                               ('screen', update.screen_updates)):
+            for control in controls:
+                key = (kind, control.id)
+                existing = self.controls.get(key)
+                if existing is None:
+                    self.controls[key] = copy.copy(control)
+                    continue
+
+                coalesced += 1
+                for field, value in vars(control).items():
+                    # No clicks means nothing to say about them, as for None; len()
+                    # because the truth of a NumPy array is ambiguous
+                    if value is not None and not (field == 'clicks' and not len(value)):
+                        setattr(existing, field, value)
+        return coalesced
+
+    def build(self):
+        update = ProgressUpdate()
+        update.state = self.state
+        for (kind, _), control in self.controls.items():
+            getattr(update, kind + '_updates').append(control)
+        return update
+
+
+class OutboundScheduler:
+    """
+    Rate limits outgoing progress updates with a token bucket, sending
+    higher priority classes first when updates have to wait. Classes,
+    from highest priority to lowest:
+
+    critical  state and cooldown/fired/disabled changes. Always queued,
+              never dropped.
+    normal    queued in order, but only the newest `max_queue` are kept;
+              older ones are shed.
+    cosmetic  coalesced into a single pending update, with newer values
+              for a control replacing older ones.
+
+    Updates are classified by classify() unless a class is given to
+    send() explicitly.
+    """
+
+    def __init__(self, client, rate, burst=None, max_queue=100):
+        self._client = client
+        self._loop = client.loop
+        self.bucket = TokenBucket(rate, burst if burst is not None else max(1, rate), self._loop.time)
+        self.max_queue = max_queue
+
+        self._critical = collections.deque()
+        self._normal = collections.deque()
+        self._cosmetic = None
+        self._timer = None
+        self._loop_thread = threading.get_ident()
+
+        metrics = client.metrics
+        self._counters = {
+            name: {
+                'sent': metrics.counter('updates_sent_total', "Updates sent by the rate limiter", cls=name),
+                'queued': metrics.counter('updates_queued_total', "Updates that had to wait for a token", cls=name),
+                'shed': metrics.counter('updates_shed_total', "Updates dropped by the rate limiter", cls=name),
+                'coalesced': metrics.counter('updates_coalesced_total', "Control updates merged into a later one",
+                                             cls=name),
+            } for name in CLASSES
+        }
+        metrics.gauge_function('updates_pending', lambda: self.pending(), "Updates waiting for a token")
+
+    def pending(self):
+        return len(self._critical) + len(self._normal) + (self._cosmetic is not None)
+
+    def submit(self, update: ProgressUpdate, cls=None):
+        """Sends an update now if there is a token for it, otherwise queues it."""
+        if threading.get_ident() != self._loop_thread:
+            self._loop.call_soon_threadsafe(self.submit, update, cls)
+            return
+
+        if cls is None:
+            cls = classify(update)
+        elif cls not in CLASSES:
+            raise ValueError("priority must be one of {}".format(", ".join(CLASSES)))
+        update._check_vars()
+
+        if not self.pending() and self.bucket.take():
+            self._send(update, cls)
+            return
+
+        counters = self._counters[cls]
+        counters['queued'].inc()
+        if cls == 'critical':
+            self._critical.append(update)
+        elif cls == 'normal':
+            if len(self._normal) >= self.max_queue:
+                self._normal.popleft()
+                counters['shed'].inc()
+            self._normal.append(update)
+        else:
+            if self._cosmetic is None:
+                self._cosmetic = _Coalesced()
+            counters['coalesced'].inc(self._cosmetic.merge(update))
+
+        self._schedule()
+
+    def _send(self, update, cls):
+        self._counters[cls]['sent'].inc()
+        self._client.connection.send(update.to_probuf())
+
+    def _schedule(self):
+        if self._timer is None and self.pending():
+            self._timer = self._loop.call_later(self.bucket.wait_time(), self._drain)
+
+    def _drain(self):
+        self._timer = None
+        while self.pending() and self.bucket.take():
+            if self._critical:
+                self._send(self._critical.popleft(), 'critical')
+            elif self._normal:
+                self._send(self._normal.popleft(), 'normal')
+            else:
+                cosmetic, self._cosmetic = self._cosmetic, None
+                self._send(cosmetic.build(), 'cosmetic')
+        self._schedule()
+
+    def stats(self):
+        """Returns {class: {'sent', 'queued', 'shed', 'coalesced'}} plus what is waiting right now."""
+        result = {name: {k: c.value for k, c in counters.items()} for name, counters in self._counters.items()}
+        result['critical']['waiting'] = len(self._critical)
+        result['normal']['waiting'] = len(self._normal)
+        result['cosmetic']['waiting'] = len(self._cosmetic.controls) if self._cosmetic is not None else 0
+        return result
+
+    def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+def _conflicts(pending, update):
+    """
+    Whether merging update into a _Coalesced would lose a fire or a
+    release, i.e. it flips `fired` on a tactile that already has it set.
+    Those have to go out in separate frames.
+    """
+    for tactile in update.tactile_updates:
+        if tactile.fired is None:
+            continue
+        existing = pending.controls.get(('tactile', tactile.id))
+        if existing is not None and existing.fired is not None and existing.fired != tactile.fired:
+            return True
+    return False
+
+
+class TickScheduler:
+    """
+    Sends at most one progress update per tick, at a fixed `rate` in
+    ticks per second. Everything sent during a tick is merged into the
+    update that goes out at the end of it, newer values for a control
+    replacing older ones. A fire and its release are never merged; the
+    release waits for the next tick instead.
+
+    Ticks stay on a fixed grid, and the timer only runs while there is
+    something to send. If the loop stalls past one or more ticks, what
+    is pending goes out in a single frame as soon as it can, the missed
+    ticks are counted as overruns, and the next tick is back on the grid.
+
+    It takes the same submit() calls as OutboundScheduler; the priority
+    class is ignored.
+    """
+
+    def __init__(self, client, rate):
+        self._client = client
+        self._loop = client.loop
+        self.interval = 1 / rate
+        self._origin = self._loop.time()
+        self._deadline = None
+        self._timer = None
+        self._pending = None
+        self._deferred = collections.deque()
+        self._loop_thread = threading.get_ident()
+
+        self.jitter = Histogram()
+        metrics = client.metrics
+        self._ticks = metrics.counter('ticks_total', "Ticks that sent an update")
+        self._overruns = metrics.counter('tick_overruns_total', "Ticks missed because the loop stalled")
+        self._merged = metrics.counter('tick_updates_merged_total', "Updates merged into a tick's frame")
+        self._last_jitter = metrics.gauge('tick_jitter_seconds', "How late the last tick ran")
+        metrics.gauge_function('tick_jitter_p99_seconds', lambda: self.jitter.percentile(99) or 0,
+                               "99th percentile of how late ticks run")
+
+    def pending(self):
+        return (self._pending is not None) + len(self._deferred)
+
+    def submit(self, update: ProgressUpdate, cls=None):
+        """Adds an update to the frame for the current tick."""
+        if threading.get_ident() != self._loop_thread:
+            self._loop.call_soon_threadsafe(self.submit, update, cls)
+            return
+
+        update._check_vars()
+        if self._deferred or (self._pending is not None and _conflicts(self._pending, update)):
+            self._deferred.append(update)
+        else:
+            self._merge(update)
+        self._schedule()
+
+    def _merge(self, update):
+        if self._pending is None:
+            self._pending = _Coalesced()
+        self._pending.merge(update)
+        self._merged.inc()
+
+    def _schedule(self):
+        if self._timer is not None:
+            return
+        now = self._loop.time()
+        # The first grid point after now, so two frames are never less than a tick apart
+        self._deadline = self._origin + ((now - self._origin) // self.interval + 1) * self.interval
+        self._timer = self._loop.call_at(self._deadline, self._tick)
+
+    def _tick(self):
+        self._timer = None
+        now = self._loop.time()
+        late = max(0.0, now - self._deadline)
+        self.jitter.record(late)
+        self._last_jitter.set(late)
+        missed = int(late // self.interval)
+        if missed:
+            self._overruns.inc(missed)
+
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            self._ticks.inc()
+            self._client.connection.send(pending.build().to_probuf())
+
+        while self._deferred and (self._pending is None or not _conflicts(self._pending, self._deferred[0])):
+            self._merge(self._deferred.popleft())
+
+        if self.pending():
+            self._schedule()
+
+    def stats(self):
+        """Returns tick counts and the jitter histogram."""
+        return {
+            'ticks': self._ticks.value,
+            'overruns': self._overruns.value,
+            'merged': self._merged.value,
+            'waiting': self.pending(),
+            'jitter': self.jitter.snapshot(),
+        }
+
+    def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
@@ -0,0 +1,159 @@
+"""
+Replays a recorded session (see beam_interactive_modified.capture)
+through a BeamInteractiveClient's handlers, with no network involved.
+Everything the handlers send() is collected so it can be compared
+against a golden recording.
+
+    client = BeamInteractiveClient(oauth='', timeout=1, on_report=on_report)
+    result = Replayer(client, 'session.cap', speed=None).run()
+    print(result.reports_per_second)
+    assert not result.diff('golden.cap')
+"""
+
+import asyncio
+import time
+
+from beam_interactive_unofficial.beam_interactive_modified import proto, CaptureReader, CaptureWriter
+from beam_interactive_unofficial.beam_interactive_modified.capture import INBOUND, OUTBOUND
+from beam_interactive_unofficial.beam_interactive_modified.connection import Connection
+
+
+class _ReplaySocket:
+    """Collects sent frames. Nothing is ever received."""
+
+    def __init__(self, loop):
+        self._closed = asyncio.Future(loop=loop)
+        self.sent = []
+
+    @asyncio.coroutine
+    def send(self, data):
+        self.sent.append(data)
+
+    @asyncio.coroutine
+    def recv(self):
+        yield from self._closed
+
+    def close(self):
+        pass
+
+
+def load_frames(source, direction):
+    """
+    Returns the data of every frame in one direction from a capture path
+    or CaptureReader. A list of frames (bytes) is returned as-is.
+    """
+    if isinstance(source, (list, tuple)):
+        return list(source)
+    if isinstance(source, str):
+        with CaptureReader(source) as reader:
+            return [frame.data for frame in reader.frames(direction=direction)]
+    return [frame.data for frame in source.frames(direction=direction)]
+
+
+class ReplayResult:
+    def __init__(self, sent, frames, reports, elapsed, busy):
+        self.sent = sent  # type: list
+        self.frames = frames
+        self.reports = reports
+        self.elapsed = elapsed
+        self.busy = busy
+
+    @property
+    def reports_per_second(self):
+        """Reports handled per second of handler time."""
+        return self.reports / self.busy if self.busy else float('inf')
+
+    def save(self, path):
+        """Saves the sent frames as a capture, to use as a golden recording."""
+        with CaptureWriter(path) as writer:
+            for data in self.sent:
+                writer.record(OUTBOUND, data)
+
+    def diff(self, golden):
+        """
+        Compares the sent frames against a golden recording (a capture
+        path, CaptureReader or list of frames). Handshakes in the golden
+        recording are skipped, so a live capture can be used directly.
+        Returns a list of (position, expected, actual) for each frame
+        that differs, with packets decoded where possible.
+        """
+        expected = [data for data in load_frames(golden, OUTBOUND) if data[:1] != bytes([proto.id.handshake])]
+        differences = []
+        for n in range(max(len(expected), len(self.sent))):
+            want = expected[n] if n < len(expected) else None
+            got = self.sent[n] if n < len(self.sent) else None
+            if want != got:
+                differences.append((n, _describe(want), _describe(got)))
+        return differences
+
+
+def _describe(data):
+    if data is None:
+        return None
+    try:
+        return proto.decode(data)
+    except Exception:
+        return data
+
+
+class Replayer:
+    """
+    Feeds the inbound frames of a capture through a client's dispatch
+    path. `speed` is a multiplier on the recorded timing (1 is real time,
+    10 is ten times faster), or None to go as fast as possible.
+    """
+
+    def __init__(self, client, capture, speed=None):
+        self._client = client
+        self._frames = capture
+        self.speed = speed
+
+    def run(self):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.run_coro(loop))
+        finally:
+            loop.close()
+
+    @asyncio.coroutine
+    def run_coro(self, loop):
+        socket = _ReplaySocket(loop)
+        connection = Connection(socket, loop)
+        client = self._client
+        client._attach(loop, connection)
+
+        if isinstance(self._frames, str):
+            reader = CaptureReader(self._frames)
+            frames = [(frame.timestamp, frame.data) for frame in reader.frames(direction=INBOUND)]
+            reader.close()
+        else:
+            frames = [(frame.timestamp, frame.data) for frame in self._frames.frames(direction=INBOUND)]
+
+        reports = busy = 0
+        started = time.perf_counter()
+        first = frames[0][0] if frames else 0
+        try:
+            for timestamp, data in frames:
+                if self.speed:
+                    delay = (timestamp - first) / self.speed - (time.perf_counter() - started)
+                    if delay > 0:
+                        yield from asyncio.sleep(delay, loop=loop)
+
+                handling = time.perf_counter()
+                connection._push_packet(data)
+                while connection._read_queue:
+                    packet = connection.get_packet()
+                    if packet[0] is not None and proto.id.get_packet_id(packet[0]) == proto.id.report:
+                        reports += 1
+                    yield from client._handle_packet(packet)
+                    connection.packet_handled(packet)
+
+                # let the sends the handlers scheduled reach the socket
+                while connection._write_queue_depth.value > 0:
+                    yield from asyncio.sleep(0, loop=loop)
+                busy += time.perf_counter() - handling
+        finally:
+            connection.close()
+            yield from connection.wait_closed()
+
+        return ReplayResult(socket.sent, len(frames), reports, time.perf_counter() - started, busy)
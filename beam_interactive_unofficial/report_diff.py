@@ -0,0 +1,85 @@
+from collections import namedtuple
+
+# What changed on a control since the last event for it. `previous` holds
+# the control's values from that event, in the same order, or is None the
+# first time the control is seen.
+TactileChange = namedtuple('TactileChange', 'id holding press_frequency release_frequency previous')
+JoystickChange = namedtuple('JoystickChange', 'id x y previous')
+ScreenChange = namedtuple('ScreenChange', 'id clicks x y previous')
+
+
+def _changed(old, new, epsilon):
+    for a, b in zip(old, new):
+        if abs(a - b) > epsilon:
+            return True
+    return False
+
+
+def _forget_missing(seen, controls):
+    present = {control.id for control in controls}
+    for control_id in [control_id for control_id in seen if control_id not in present]:
+        del seen[control_id]
+
+
+class ReportDiffer:
+    """
+    Turns a stream of Reports into change events. The last values seen for
+    each control are kept as a tuple per id, and a control only produces an
+    event when one of its values has moved more than `epsilon` since its
+    last event - so values that drift slowly still get reported once the
+    drift adds up. For tactiles that's holding, pressFrequency and
+    releaseFrequency; for joysticks coordMean; for screens clicks and
+    coordMean.
+
+    A control that drops out of a report is forgotten, and counts as new
+    if it comes back.
+    """
+
+    def __init__(self, epsilon=0.0):
+        self.epsilon = epsilon
+        self._tactile = {}  # id -> (holding, pressFrequency, releaseFrequency)
+        self._joystick = {}  # id -> (x, y)
+        self._screen = {}  # id -> (clicks, x, y)
+
+    def reset(self):
+        """Forgets every control, so the next report produces an event for each."""
+        self._tactile.clear()
+        self._joystick.clear()
+        self._screen.clear()
+
+    def diff(self, report):
+        """Returns the change events for a Report, tactiles first, then joysticks, then screens."""
+        events = []
+        epsilon = self.epsilon
+
+        seen = self._tactile
+        for tactile in report.tactile:
+            values = (tactile.holding, tactile.pressFrequency, tactile.releaseFrequency)
+            previous = seen.get(tactile.id)
+            if previous is None or (previous != values and _changed(previous, values, epsilon)):
+                events.append(TactileChange(tactile.id, values[0], values[1], values[2], previous))
+                seen[tactile.id] = values
+        if len(seen) != len(report.tactile):
+            _forget_missing(seen, report.tactile)
+
+        seen = self._joystick
+        for joystick in report.joystick:
+            values = (joystick.coordMean.x, joystick.coordMean.y)
+            previous = seen.get(joystick.id)
+            if previous is None or (previous != values and _changed(previous, values, epsilon)):
+                events.append(JoystickChange(joystick.id, values[0], values[1], previous))
+                seen[joystick.id] = values
+        if len(seen) != len(report.joystick):
+            _forget_missing(seen, report.joystick)
+
+        seen = self._screen
+        for screen in report.screen:
+            values = (screen.clicks, screen.coordMean.x, screen.coordMean.y)
+            previous = seen.get(screen.id)
+            if previous is None or (previous != values and _changed(previous, values, epsilon)):
+                events.append(ScreenChange(screen.id, values[0], values[1], values[2], previous))
+                seen[screen.id] = values
+        if len(seen) != len(report.screen):
+            _forget_missing(seen, report.screen)
+
+        return events
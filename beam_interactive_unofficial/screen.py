@@ -0,0 +1,106 @@
+"""
+Click heatmaps for screen controls, kept as NumPy grids. NumPy is only
+needed if you use this module.
+"""
+
+import time
+
+import numpy as np
+
+from beam_interactive_unofficial.progress_update import ProgressUpdate, ScreenUpdate
+
+# Stddevs narrower than this (in screen units) are widened to it, so a
+# report where everyone clicked the same spot still lands in a cell.
+_MIN_SPREAD = 1e-3
+
+
+class ScreenHeatmap:
+    """
+    Accumulates a width x height grid of clicks for every screen control.
+    Reports only give the number of clicks and their mean and stddev, so
+    each report's clicks are spread over the grid as a Gaussian with that
+    mean and stddev. Older clicks fade, halving every `half_life` seconds.
+
+    Coordinates are taken to run from 0 to 1 on both axes, as screen
+    click coordinates do.
+    """
+
+    def __init__(self, width=32, height=32, half_life=5.0, clock=time.monotonic):
+        self.width = width
+        self.height = height
+        self.half_life = half_life
+        self._clock = clock
+        self.grids = {}  # screen id -> (height, width) float array
+        self._last = None
+        # Cell centres along each axis
+        self._xs = (np.arange(width) + 0.5) / width
+        self._ys = (np.arange(height) + 0.5) / height
+
+    def update(self, report, now=None):
+        """Decays every grid, then adds the clicks from a Report's screens."""
+        if now is None:
+            now = self._clock()
+        if self._last is not None and self.grids:
+            decay = 0.5 ** ((now - self._last) / self.half_life)
+            for grid in self.grids.values():
+                grid *= decay
+        self._last = now
+
+        for screen in report.screen:
+            if not screen.clicks:
+                continue
+            grid = self.grids.get(screen.id)
+            if grid is None:
+                grid = self.grids[screen.id] = np.zeros((self.height, self.width))
+            self._deposit(grid, screen.clicks, screen.coordMean.x, screen.coordMean.y,
+                          screen.coordStddev.x, screen.coordStddev.y)
+
+    def _deposit(self, grid, clicks, mean_x, mean_y, stddev_x, stddev_y):
+        # The Gaussian is separable, so it is the outer product of one per axis
+        gx = np.exp(-0.5 * ((self._xs - mean_x) / max(stddev_x, _MIN_SPREAD)) ** 2)
+        gy = np.exp(-0.5 * ((self._ys - mean_y) / max(stddev_y, _MIN_SPREAD)) ** 2)
+        total = gx.sum() * gy.sum()
+        if total > 0:
+            grid += np.outer(gy, gx) * (clicks / total)
+
+    def hot_cells(self, screen_id, count=10, threshold=0.0):
+        """
+        Returns the `count` hottest cells of a screen's grid as an (N, 3)
+        array of x, y, intensity rows, hottest first. x and y are cell
+        centres; intensity is relative to the hottest cell, so it runs up
+        to 1. Cells with an intensity at or below threshold are left out.
+        """
+        grid = self.grids.get(screen_id)
+        if grid is None or count <= 0:
+            return np.empty((0, 3))
+        peak = grid.max()
+        if peak <= 0:
+            return np.empty((0, 3))
+
+        flat = grid.ravel()
+        count = min(count, flat.size)
+        # argpartition finds the top cells without sorting the whole grid
+        top = np.argpartition(flat, flat.size - count)[flat.size - count:]
+        top = top[np.argsort(flat[top])[::-1]]
+        intensities = flat[top] / peak
+        top, intensities = top[intensities > threshold], intensities[intensities > threshold]
+
+        rows, columns = np.divmod(top, self.width)
+        return np.column_stack((self._xs[columns], self._ys[rows], intensities))
+
+    def screen_update(self, screen_id, count=10, threshold=0.0) -> ScreenUpdate:
+        """A ScreenUpdate showing a screen's hot cells as clicks."""
+        return ScreenUpdate(id_=screen_id, clicks=self.hot_cells(screen_id, count, threshold))
+
+    def progress(self, count=10, threshold=0.0) -> ProgressUpdate:
+        """A ProgressUpdate with a screen_update() for every screen seen so far."""
+        update = ProgressUpdate()
+        update.screen_updates = [self.screen_update(screen_id, count, threshold) for screen_id in self.grids]
+        return update
+
+    def reset(self, screen_id=None):
+        """Clears one screen's grid, or all of them."""
+        if screen_id is None:
+            self.grids.clear()
+        else:
+            self.grids.pop(screen_id, None)
@@ -0,0 +1,118 @@
+import asyncio
+import collections
+
+
+class PacketStream:
+    """
+    An async iterator over the packets a BeamInteractiveClient receives.
+    Get one from client.packets() or client.reports() rather than making
+    it directly.
+
+    With batch=N, each step yields a list of up to N packets instead of a
+    single one. Once the first packet is available the stream waits up to
+    `timeout` seconds for the batch to fill (or not at all if timeout is
+    None), so a consumer can deal with several packets per wakeup.
+
+    If the client is handling packets in the background (start(), or
+    connect()), the stream is fed from that. Otherwise, or when iterating
+    from inside one of the client's handlers, iterating the stream pulls
+    packets off the connection itself, and they still go through the
+    client's handlers on the way.
+
+    A stream keeps buffering until it is closed, so if you stop iterating
+    early, close() it - or use it as `async with client.reports() as reports:`.
+    """
+
+    def __init__(self, client, packet_id=None, batch=None, timeout=None, maxlen=None):
+        self._client = client
+        self._packet_id = packet_id
+        self._batch = batch
+        self._timeout = timeout
+        self._items = collections.deque(maxlen=maxlen)
+        self._waiter = None
+        self._finished = False
+
+    def __aiter__(self):
+        return self
+
+    @asyncio.coroutine
+    def __anext__(self):
+        yield from self._fill(None)
+        if not self._items:
+            self.close()
+            raise StopAsyncIteration
+
+        if self._batch is None:
+            return self._items.popleft()
+
+        if self._timeout is not None and len(self._items) < self._batch:
+            deadline = self._client.loop.time() + self._timeout
+            while len(self._items) < self._batch and not self._finished:
+                if not (yield from self._wait(deadline)):
+                    break
+
+        items = self._items
+        return [items.popleft() for _ in range(min(self._batch, len(items)))]
+
+    @asyncio.coroutine
+    def _fill(self, deadline):
+        while not self._items and not self._finished:
+            if not (yield from self._wait(deadline)):
+                return
+
+    @asyncio.coroutine
+    def _wait(self, deadline):
+        """
+        Waits for the next packet to arrive (in any stream). Returns False
+        if the deadline passed first.
+        """
+        loop = self._client.loop
+        receiver = self._client._receiving
+        # Read packets ourselves if nothing else is, or if the reader is the
+        # task iterating us - a handler - and so can't read until we're done
+        pulling = receiver is None or receiver is asyncio.Task.current_task(loop=loop)
+        if pulling:
+            waiter = self._client._pull()
+        else:
+            waiter = self._waiter = asyncio.Future(loop=loop)
+
+        timeout = None
+        if deadline is not None:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                return False
+
+        done, _ = yield from asyncio.wait([waiter], timeout=timeout, loop=loop)
+        if pulling and done and not waiter.cancelled():
+            # Raises anything the client's handlers raised while pulling, so
+            # it reaches whoever is iterating rather than being lost
+            waiter.result()
+        return bool(done)
+
+    def _offer(self, packet_id, decoded):
+        if self._packet_id is None or packet_id == self._packet_id:
+            self._items.append(decoded)
+            self._wake()
+
+    def _finish(self):
+        self._finished = True
+        self._wake()
+
+    def _wake(self):
+        waiter, self._waiter = self._waiter, None
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def close(self):
+        """Stops the stream. Packets received after this are not buffered."""
+        self._finish()
+        if self in self._client._streams:
+            self._client._streams.remove(self)
+
+    @asyncio.coroutine
+    def __aenter__(self):
+        return self
+
+    @asyncio.coroutine
+    def __aexit__(self, *exc_info):
+        self.close()
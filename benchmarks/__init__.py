@@ -0,0 +1,20 @@
+"""
+Micro and end-to-end benchmarks for the hot paths of the client.
+
+Run them with `python -m benchmarks run -o results.json`, and check a
+change for regressions with `python -m benchmarks compare old.json new.json`.
+"""
+
+from .runner import benchmark, registered, run, save, load, compare
+
+MODULES = ['bench_proto', 'bench_progress_update', 'bench_client', 'bench_session', 'bench_capture', 'bench_threads', 'bench_tactile',
+           'bench_compression', 'bench_cooldowns', 'bench_report_diff',
+           'bench_subscriptions', 'bench_audience', 'bench_joystick',
+           'bench_screen', 'bench_import', 'bench_backends']
+
+
+def load_all():
+    """Imports every benchmark module so that they register themselves."""
+    import importlib
+    for name in MODULES:
+        importlib.import_module('.' + name, __name__)
@@ -0,0 +1,54 @@
+import argparse
+import sys
+
+from . import load_all, run, save, load, compare
+
+
+def _run(args):
+    load_all()
+    results = run(args.filter, repeat=args.repeat, min_time=args.min_time)
+    if args.output:
+        save(results, args.output)
+        print("Results written to {}".format(args.output))
+    return 0
+
+
+def _compare(args):
+    rows, regressions = compare(load(args.baseline), load(args.current), threshold=args.threshold / 100)
+    for name, old, new, change in rows:
+        print("{:<48} {:>12.1f} -> {:>12.1f} ns  {:+7.1f}%{}".format(
+            name, old, new, change * 100, "  REGRESSION" if name in regressions else ""))
+
+    if regressions:
+        print("\n{} benchmark(s) regressed by more than {}%".format(len(regressions), args.threshold),
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    run_parser = commands.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('-o', '--output', help='write results as JSON to this file')
+    run_parser.add_argument('-k', '--filter', help='only run benchmarks whose name contains this')
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--min-time', type=float, default=0.1,
+                            help='minimum seconds per sample (default: %(default)s)')
+    run_parser.set_defaults(func=_run)
+
+    compare_parser = commands.add_parser('compare', help='compare two result files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('-t', '--threshold', type=float, default=10.0,
+                                help='percentage slowdown counted as a regression (default: %(default)s)')
+    compare_parser.set_defaults(func=_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,35 @@
+from beam_interactive_unofficial.audience import AudienceAnalytics
+
+from .fixtures import make_report
+from .runner import benchmark
+
+
+@benchmark('audience.update')
+def update():
+    reports = [make_report(users=100 + i, qgram=10) for i in range(10)]
+    audience = AudienceAnalytics()
+    now = [0.0]
+
+    def run():
+        for report in reports:
+            now[0] += 0.1
+            audience.update(report, now[0])
+
+    return run
+
+
+@benchmark('audience.update_and_snapshot')
+def update_and_snapshot():
+    """What a dashboard polling on every report costs."""
+    reports = [make_report(users=100 + i, qgram=10) for i in range(10)]
+    audience = AudienceAnalytics()
+    now = [0.0]
+
+    def run():
+        for report in reports:
+            now[0] += 0.1
+            audience.update(report, now[0])
+            audience.snapshot()
+            audience.snapshot()
+
+    return run
@@ -0,0 +1,93 @@
+"""
+Raw ParseFromString/SerializeToString on Reports and ProgressUpdates,
+which is all the protobuf backend decides. A process can only use one
+backend, so these are registered under the name of the one in use;
+`python -m benchmarks.bench_backends` runs them once per backend, each in
+its own interpreter with PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION set, and
+prints them side by side. Backends that aren't installed are skipped.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from beam_interactive_unofficial.beam_interactive_modified import proto
+
+from .fixtures import make_report, make_update
+from .runner import benchmark
+
+BACKENDS = ('upb', 'cpp', 'python')
+
+PACKETS = {
+    'report': lambda: make_report(),
+    'report_large': lambda: make_report(tactiles=500, joysticks=10, screens=5),
+    'progress_update': lambda: make_update().to_probuf(),
+}
+
+
+def _parse_benchmark(packet):
+    data, message = packet.SerializeToString(), type(packet)()
+    return lambda: message.ParseFromString(data)
+
+
+def _serialize_benchmark(packet):
+    return packet.SerializeToString
+
+
+try:
+    _backend = proto.backend()
+    # Forcing a backend that isn't installed only fails once a message is made
+    proto.Report()
+except ImportError:
+    _backend = None
+
+if _backend is not None:
+    for _name, _make in PACKETS.items():
+        benchmark('protobuf.{}.parse.{}'.format(_backend, _name), group='protobuf')(
+            lambda make=_make: _parse_benchmark(make()))
+        benchmark('protobuf.{}.serialize.{}'.format(_backend, _name), group='protobuf')(
+            lambda make=_make: _serialize_benchmark(make()))
+
+
+def run_backend(backend, repeat=5, min_time=0.1):
+    """
+    Runs these benchmarks in a fresh interpreter using the given backend.
+    Returns their results keyed by operation and packet, e.g.
+    'parse.report', or None if the backend isn't available.
+    """
+    env = dict(os.environ, PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION=backend)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'results.json')
+        command = [sys.executable, '-m', 'benchmarks', 'run', '-k', 'protobuf.{}.'.format(backend),
+                   '--repeat', str(repeat), '--min-time', str(min_time), '-o', path]
+        result = subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        if result.returncode or not os.path.exists(path):
+            return None
+        with open(path) as f:
+            results = json.load(f)['results']
+    prefix = 'protobuf.{}.'.format(backend)
+    return {name[len(prefix):]: value['median_ns'] for name, value in results.items()}
+
+
+def main():
+    columns = [(backend, run_backend(backend)) for backend in BACKENDS]
+    available = [(backend, results) for backend, results in columns if results]
+    for backend, results in columns:
+        if not results:
+            print("{} backend isn't available, skipping it".format(backend))
+    if not available:
+        return 1
+
+    print("{:<32}".format('ns per call') + "".join("{:>14}".format(backend) for backend, _ in available))
+    for operation in ('parse', 'serialize'):
+        for packet in PACKETS:
+            name = '{}.{}'.format(operation, packet)
+            print("{:<32}".format(name) + "".join("{:>14.1f}".format(results[name]) for _, results in available))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+
+from beam_interactive_unofficial.beam_interactive_modified import proto, CaptureWriter, CaptureReader
+from beam_interactive_unofficial.beam_interactive_modified.capture import INBOUND
+
+from .fixtures import make_report
+from .runner import benchmark
+
+FRAMES = 1000
+
+
+@benchmark('capture.record')
+def record():
+    directory = tempfile.mkdtemp()
+    writer = CaptureWriter(os.path.join(directory, 'capture'))
+    data = proto.encode(make_report())
+
+    def teardown():
+        writer.close()
+        shutil.rmtree(directory)
+
+    return lambda: writer.record(INBOUND, data), teardown
+
+
+@benchmark('capture.scan_x{}'.format(FRAMES))
+def scan():
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'capture')
+    with CaptureWriter(path) as writer:
+        data = proto.encode(make_report())
+        for _ in range(FRAMES):
+            writer.record(INBOUND, data)
+    reader = CaptureReader(path)
+
+    def run():
+        for frame in reader.frames(copy=False):
+            frame.data.release()
+
+    def teardown():
+        reader.close()
+        shutil.rmtree(directory)
+
+    return run, teardown
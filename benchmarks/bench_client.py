@@ -0,0 +1,143 @@
+import asyncio
+
+from beam_interactive_unofficial import BeamInteractiveClient
+from beam_interactive_unofficial.beam_interactive_modified import LatencyRecorder
+from beam_interactive_unofficial.beam_interactive_modified.connection import Connection
+from beam_interactive_unofficial.rate_limit import TickScheduler
+
+from .fixtures import make_update
+from .runner import benchmark
+
+BATCH = 100
+
+
+class LoopbackSocket:
+    """
+    A stand-in for a websockets client connection. Sent frames are
+    counted (and kept, if asked), and recv() blocks until something
+    is fed in or the socket is closed.
+    """
+
+    def __init__(self, loop, keep=False):
+        self._loop = loop
+        self._keep = keep
+        self._incoming = asyncio.Queue(loop=loop)
+        self.sent = []
+        self.sent_count = 0
+        self.sent_bytes = 0
+
+    @asyncio.coroutine
+    def send(self, data):
+        self.sent_count += 1
+        self.sent_bytes += len(data)
+        if self._keep:
+            self.sent.append(data)
+
+    @asyncio.coroutine
+    def recv(self):
+        return (yield from self._incoming.get())
+
+    def feed(self, data):
+        self._incoming.put_nowait(data)
+
+    def close(self):
+        pass
+
+
+def make_client(loop, socket, latency=None):
+    """
+    Builds a BeamInteractiveClient that is wired straight to the given
+    socket, skipping the REST calls and the handshake.
+    """
+    client = BeamInteractiveClient(oauth='', timeout=1)
+    client.latency = latency
+    client._attach(loop, Connection(socket, loop, latency=latency))
+    client._num_buttons = 50
+    return client
+
+
+def close_client(loop, client):
+    """Shuts down a client made by make_client, along with its loop."""
+    client.connection.close()
+    loop.run_until_complete(client.connection.wait_closed())
+    loop.close()
+
+
+def _send_benchmark(make, latency=None, cache=True, send=None):
+    loop = asyncio.new_event_loop()
+    socket = LoopbackSocket(loop)
+    client = make_client(loop, socket, latency)
+    if not cache:
+        client.packet_cache = None
+    update = make()
+    send = send(client) if send is not None else client.send
+
+    def run():
+        target = socket.sent_count + BATCH
+        for _ in range(BATCH):
+            send(update)
+        while socket.sent_count < target:
+            loop.run_until_complete(asyncio.sleep(0, loop=loop))
+
+    return run, lambda: close_client(loop, client)
+
+
+@benchmark('client.send.state_x{}'.format(BATCH))
+def send_state():
+    return _send_benchmark(lambda: {'state': 'LOBBY'})
+
+
+@benchmark('client.send.state_uncached_x{}'.format(BATCH))
+def send_state_uncached():
+    return _send_benchmark(lambda: {'state': 'LOBBY'}, cache=False)
+
+
+@benchmark('client.send.progress_update_uncached_x{}'.format(BATCH))
+def send_progress_update_uncached():
+    return _send_benchmark(make_update, cache=False)
+
+
+@benchmark('client.send.precompiled_x{}'.format(BATCH))
+def send_precompiled():
+    def setup_send(client):
+        client.precompile('playing', make_update())
+        return lambda name: client.send_precompiled(name)
+
+    return _send_benchmark(lambda: 'playing', send=setup_send)
+
+
+@benchmark('client.send.state_latency_x{}'.format(BATCH))
+def send_state_latency():
+    return _send_benchmark(lambda: {'state': 'LOBBY'}, LatencyRecorder())
+
+
+@benchmark('client.send.progress_update_x{}'.format(BATCH))
+def send_progress_update():
+    return _send_benchmark(make_update)
+
+
+@benchmark('client.send.dict_x{}'.format(BATCH))
+def send_dict():
+    return _send_benchmark(lambda: {'tactile': [{'id': i, 'cooldown': 500} for i in range(20)]})
+
+
+@benchmark('client.send.tick_x{}'.format(BATCH))
+def send_tick():
+    """The same updates as progress_update, merged by a TickScheduler into a single frame."""
+    loop = asyncio.new_event_loop()
+    socket = LoopbackSocket(loop)
+    client = make_client(loop, socket)
+    client.scheduler = scheduler = TickScheduler(client, 60)
+    update = make_update()
+
+    def run():
+        target = socket.sent_count + 1
+        for _ in range(BATCH):
+            client.send(update)
+        # Run the tick now rather than waiting for the timer
+        scheduler.close()
+        scheduler._tick()
+        while socket.sent_count < target:
+            loop.run_until_complete(asyncio.sleep(0, loop=loop))
+
+    return run, lambda: close_client(loop, client)
@@ -0,0 +1,120 @@
+"""
+What permessage-deflate costs the client. Reports are compressed by the
+robot and decompressed by us, so the report benchmarks time inflating a
+stream of them with the context kept between messages, as it is on a
+real connection. Progress updates go the other way.
+
+Run `python -m benchmarks.bench_compression` for the byte counts that go
+with the timings, to see where the CPU pays for the bandwidth it saves.
+"""
+
+import random
+import time
+
+from websockets.frames import Frame, OP_BINARY
+from websockets.extensions.permessage_deflate import PerMessageDeflate
+
+from beam_interactive_unofficial.beam_interactive_modified import proto
+
+from .fixtures import make_report, make_update
+from .runner import benchmark
+
+SIZES = {
+    'small': dict(tactiles=5, joysticks=1, screens=0, qgram=3),
+    'large': dict(tactiles=500, joysticks=10, screens=5),
+}
+LEVELS = (1, 6, 9)
+
+
+def _pair(level):
+    """A (sender, receiver) pair of extensions that talk to each other."""
+    settings = {'level': level}
+    sender = PerMessageDeflate(False, False, 15, 15, settings)
+    receiver = PerMessageDeflate(False, False, 15, 15, settings)
+    return sender, receiver
+
+
+def _reports(size, count=100, seed=0):
+    """
+    count encoded reports of a size, with the per-control numbers moving
+    about between them like they do on a live channel. Compressing the
+    same bytes over and over would flatter deflate.
+    """
+    rng = random.Random(seed)
+    reports = []
+    for i in range(count):
+        report = make_report(**SIZES[size])
+        report.time = 1000 + i * 100
+        report.users.active = rng.randrange(report.users.connected)
+        for tactile in report.tactile:
+            tactile.holding = rng.randrange(10)
+            tactile.pressFrequency = rng.randrange(10)
+            tactile.releaseFrequency = rng.randrange(10)
+        for control in list(report.joystick) + list(report.screen):
+            control.coordMean.x, control.coordMean.y = rng.uniform(-1, 1), rng.uniform(-1, 1)
+        reports.append(proto.encode(report))
+    return reports
+
+
+def _frames(packets, level):
+    """Compresses packets in order, as one connection would send them."""
+    sender, _ = _pair(level)
+    return [sender.encode(Frame(OP_BINARY, data)) for data in packets]
+
+
+def _report_benchmark(size, level):
+    frames = _frames(_reports(size), level)
+
+    def run():
+        # A new receiver each time, so it starts at the same point in the stream
+        _, receiver = _pair(level)
+        for frame in frames:
+            receiver.decode(frame)
+
+    return run
+
+
+def _update_benchmark(level):
+    data = proto.encode(make_update().to_probuf())
+
+    def run():
+        sender, _ = _pair(level)
+        for _ in range(100):
+            sender.encode(Frame(OP_BINARY, data))
+
+    return run
+
+
+for _size in SIZES:
+    for _level in LEVELS:
+        benchmark('compression.inflate.report_{}.level{}_x100'.format(_size, _level))(
+            lambda size=_size, level=_level: _report_benchmark(size, level))
+
+for _level in LEVELS:
+    benchmark('compression.deflate.progress_update.level{}_x100'.format(_level))(
+        lambda level=_level: _update_benchmark(level))
+
+
+def main():
+    print("{:<14} {:>6} {:>9} {:>9} {:>7} {:>12} {:>14}".format(
+        'packet', 'level', 'raw', 'wire', 'ratio', 'us/frame', 'us/KB saved'))
+    streams = [('report_' + size, _reports(size)) for size in SIZES]
+    streams.append(('progress', [proto.encode(make_update().to_probuf())] * 100))
+    for name, packets in streams:
+        raw = sum(len(data) for data in packets) / len(packets)
+        for level in LEVELS:
+            frames = _frames(packets, level)
+            _, receiver = _pair(level)
+            start = time.thread_time()
+            for frame in frames:
+                receiver.decode(frame)
+            per_frame = (time.thread_time() - start) / len(frames) * 1e6
+            wire = sum(len(frame.data) for frame in frames) / len(frames)
+            saved = (raw - wire) / 1024
+            print("{:<14} {:>6} {:>9.0f} {:>9.0f} {:>7.2f} {:>12.1f} {:>14}".format(
+                name, level, raw, wire, wire / raw, per_frame,
+                "{:.1f}".format(per_frame / saved) if saved > 0 else "-"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+import heapq
+import random
+
+from beam_interactive_unofficial.cooldowns import TimerWheel
+
+from .runner import benchmark
+
+TIMERS = 5000
+
+
+def _deadlines(seed=0):
+    """Cooldowns of up to a minute at 10ms ticks, like a big board would see."""
+    rng = random.Random(seed)
+    return [(i, rng.randrange(1, 6000)) for i in range(TIMERS)]
+
+
+@benchmark('cooldowns.wheel.insert_expire_{}'.format(TIMERS))
+def wheel_insert_expire():
+    deadlines = _deadlines()
+
+    def run():
+        wheel = TimerWheel()
+        for key, deadline in deadlines:
+            wheel.add(key, deadline)
+        # Drive it a second at a time, as the tracker's timer would in batches
+        for tick in range(99, 6000, 100):
+            wheel.advance(tick)
+
+    return run
+
+
+@benchmark('cooldowns.heap.insert_expire_{}'.format(TIMERS))
+def heap_insert_expire():
+    """The same work with a binary heap, for comparison."""
+    deadlines = _deadlines()
+
+    def run():
+        heap = []
+        for key, deadline in deadlines:
+            heapq.heappush(heap, (deadline, key))
+        for tick in range(99, 6000, 100):
+            while heap and heap[0][0] <= tick:
+                heapq.heappop(heap)
+
+    return run
+
+
+@benchmark('cooldowns.wheel.reschedule_{}'.format(TIMERS))
+def wheel_reschedule():
+    """Moving every timer, which is what re-sending a cooldown does."""
+    deadlines = _deadlines()
+    later = _deadlines(seed=1)
+    wheel = TimerWheel()
+    for key, deadline in deadlines:
+        wheel.add(key, deadline)
+
+    def run():
+        for key, deadline in later:
+            wheel.add(key, deadline)
+        for key, deadline in deadlines:
+            wheel.add(key, deadline)
+
+    return run
+
+
+@benchmark('cooldowns.heap.reschedule_{}'.format(TIMERS))
+def heap_reschedule():
+    """
+    The same with a heap, which can't move an entry: the new deadline is
+    pushed and the old entry left to be skipped, with the heap rebuilt
+    once stale entries outnumber live ones.
+    """
+    deadlines = _deadlines()
+    later = _deadlines(seed=1)
+    current = dict(deadlines)
+    heap = [(deadline, key) for key, deadline in deadlines]
+    heapq.heapify(heap)
+
+    def run():
+        nonlocal heap
+        for moves in (later, deadlines):
+            for key, deadline in moves:
+                current[key] = deadline
+                heapq.heappush(heap, (deadline, key))
+                if len(heap) > 2 * len(current):
+                    heap = [(d, k) for k, d in current.items()]
+                    heapq.heapify(heap)
+
+    return run
@@ -0,0 +1,91 @@
+"""
+How long it takes to import the package, each in a fresh interpreter so
+nothing is already cached in sys.modules. The timed benchmarks include
+interpreter startup; `python -m benchmarks.bench_import` measures the
+imports alone with -X importtime and checks them against BUDGETS,
+exiting with 1 if any import is over its budget or pulls in a
+dependency it shouldn't.
+"""
+
+import subprocess
+import sys
+
+from .runner import benchmark
+
+PACKAGE = 'beam_interactive_unofficial'
+
+# module -> (budget in milliseconds, modules it must not load)
+BUDGETS = {
+    PACKAGE: (30, ('requests', 'websockets', 'google.protobuf', 'numpy')),
+    PACKAGE + '.progress_update': (30, ('requests', 'websockets', 'google.protobuf')),
+    PACKAGE + '.beam_interactive_modified.proto': (30, ('requests', 'websockets', 'google.protobuf')),
+    PACKAGE + '.beam_interactive_modified.proto.rw': (150, ('requests', 'websockets')),
+    PACKAGE + '.interactive_client': (400, ()),
+}
+
+_REPORT = "import sys; print('\\n'.join(sys.modules))"
+
+
+def measure(module):
+    """
+    Imports module in a fresh interpreter. Returns the import's cumulative
+    time in seconds, as -X importtime reports it, and the set of modules
+    that were loaded afterwards.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import {}; {}'.format(module, _REPORT)],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    # Lines look like "import time: self [us] | cumulative | name", with
+    # nested imports indented under the one that caused them. The module's
+    # own line counts the parent packages it imported on the way.
+    cumulative = 0
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and line.split('|')[2].rstrip() == ' ' + module:
+            cumulative = int(line.split('|')[1])
+    return cumulative / 1e6, set(result.stdout.split())
+
+
+def check(budgets=BUDGETS):
+    """
+    Measures every module in budgets. Returns a list of (module, seconds,
+    budget in seconds, unwanted modules loaded) rows, and the rows that
+    are over budget or loaded something they shouldn't.
+    """
+    rows, failures = [], []
+    for module, (budget, forbidden) in budgets.items():
+        seconds, loaded = measure(module)
+        unwanted = sorted(name for name in forbidden if name in loaded)
+        row = (module, seconds, budget / 1000, unwanted)
+        rows.append(row)
+        if seconds > budget / 1000 or unwanted:
+            failures.append(row)
+    return rows, failures
+
+
+def _import_benchmark(module):
+    command = [sys.executable, '-c', 'import ' + module]
+    return lambda: subprocess.run(command, check=True)
+
+
+for _module in BUDGETS:
+    benchmark('import.' + (_module[len(PACKAGE) + 1:] or 'package'))(
+        lambda module=_module: _import_benchmark(module))
+
+# The interpreter on its own, to subtract from the timings above
+benchmark('import.interpreter')(lambda: _import_benchmark('sys'))
+
+
+def main():
+    rows, failures = check()
+    print("{:<60} {:>10} {:>10}".format('module', 'ms', 'budget'))
+    for module, seconds, budget, unwanted in rows:
+        print("{:<60} {:>10.1f} {:>10.0f}{}{}".format(
+            module, seconds * 1000, budget * 1000, "  OVER BUDGET" if seconds > budget else "",
+            "  loads " + ", ".join(unwanted) if unwanted else ""))
+    if failures:
+        print("\n{} import(s) over budget".format(len(failures)), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+import math
+
+from beam_interactive_unofficial.beam_interactive_modified import proto
+from beam_interactive_unofficial.progress_update import ProgressUpdate, JoystickUpdate
+
+from .fixtures import make_report
+from .runner import benchmark
+
+try:
+    from beam_interactive_unofficial.joystick import JoystickPipeline
+except ImportError:  # NumPy isn't installed
+    JoystickPipeline = None
+
+SIZES = (10, 200)
+
+
+def _report(joysticks):
+    report = make_report(tactiles=0, joysticks=joysticks, screens=0)
+    for i, joystick in enumerate(report.joystick):
+        joystick.coordMean.x = math.cos(i) * 0.8
+        joystick.coordMean.y = math.sin(i) * 0.8
+    return report
+
+
+def _scalar(report):
+    """Feedback built a joystick at a time, with math and JoystickUpdate."""
+    update = ProgressUpdate()
+    for joystick in report.joystick:
+        x, y = joystick.coordMean.x, joystick.coordMean.y
+        update.joystick_updates.append(JoystickUpdate(id_=joystick.id, angle=math.atan2(y, x) % (2 * math.pi),
+                                                      intensity=min(1.0, math.hypot(x, y))))
+    return update.to_probuf()
+
+
+def _scalar_benchmark(size):
+    report = _report(size)
+    return lambda: proto.encode(_scalar(report))
+
+
+def _pipeline_benchmark(size):
+    report, pipeline = _report(size), JoystickPipeline()
+    return lambda: proto.encode(pipeline.build(report))
+
+
+for _size in SIZES:
+    benchmark('joystick.scalar_{}'.format(_size))(lambda size=_size: _scalar_benchmark(size))
+    if JoystickPipeline is not None:
+        benchmark('joystick.pipeline_{}'.format(_size))(lambda size=_size: _pipeline_benchmark(size))
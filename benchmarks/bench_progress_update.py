@@ -0,0 +1,37 @@
+import json
+
+from beam_interactive_unofficial.progress_update import ProgressUpdate
+
+from .fixtures import make_update, make_update_dict
+from .runner import benchmark
+
+
+@benchmark('progress_update.to_probuf')
+def to_probuf():
+    update = make_update()
+    return update.to_probuf
+
+
+@benchmark('progress_update.to_probuf_state_only')
+def to_probuf_state_only():
+    update = ProgressUpdate()
+    update.state = 'LOBBY'
+    return update.to_probuf
+
+
+@benchmark('progress_update.check_vars')
+def check_vars():
+    update = make_update()
+    return update._check_vars
+
+
+@benchmark('progress_update.from_dict')
+def from_dict():
+    data = make_update_dict(joysticks=0, screens=0)
+    return lambda: ProgressUpdate.from_dict(data)
+
+
+@benchmark('progress_update.from_json')
+def from_json():
+    data = json.dumps(make_update_dict(joysticks=0, screens=0))
+    return lambda: ProgressUpdate.from_json(data)
@@ -0,0 +1,66 @@
+from beam_interactive_unofficial.beam_interactive_modified import proto
+from beam_interactive_unofficial.beam_interactive_modified.proto import varint
+
+from .fixtures import make_report, make_update
+from .runner import benchmark
+
+
+@benchmark('proto.encode.progress_update')
+def encode_progress_update():
+    packet = make_update().to_probuf()
+    return lambda: proto.encode(packet)
+
+
+@benchmark('proto.encode.handshake')
+def encode_handshake():
+    packet = proto.Handshake()
+    packet.channel, packet.streamKey = 12345, 'stream-key'
+    return lambda: proto.encode(packet)
+
+
+@benchmark('proto.decode.report')
+def decode_report():
+    data = proto.encode(make_report())
+    return lambda: proto.decode(data)
+
+
+@benchmark('proto.decode.report_large')
+def decode_report_large():
+    data = proto.encode(make_report(tactiles=500, joysticks=10, screens=5))
+    return lambda: proto.decode(data)
+
+
+@benchmark('proto.varint.encode')
+def varint_encode():
+    buffer = bytearray()
+    write = buffer.append
+
+    def run():
+        del buffer[:]
+        varint.varuint_encode(write, 1 << 35)
+
+    return run
+
+
+@benchmark('proto.varint.decode')
+def varint_decode():
+    buffer = bytearray()
+    varint.varuint_encode(buffer.append, 1 << 35)
+    data = bytes(buffer)
+    return lambda: varint.varuint_decode(data, 0)
+
+
+@benchmark('proto.identifier.get_packet_id')
+def identifier_get_packet_id():
+    packet = proto.ProgressUpdate()
+    return lambda: proto.id.get_packet_id(packet)
+
+
+@benchmark('proto.identifier.get_packet_from_id')
+def identifier_get_packet_from_id():
+    return lambda: proto.id.get_packet_from_id(4)
+
+
+@benchmark('proto.identifier.by_name')
+def identifier_by_name():
+    return lambda: proto.id.progress_update
@@ -0,0 +1,68 @@
+from beam_interactive_unofficial.report_diff import ReportDiffer
+
+from .fixtures import make_report
+from .runner import benchmark
+
+TACTILES = 500
+
+
+def _reports(changes):
+    """Two large reports that differ on `changes` tactiles, to diff alternately."""
+    first = make_report(tactiles=TACTILES, joysticks=10, screens=5)
+    second = make_report(tactiles=TACTILES, joysticks=10, screens=5)
+    for tactile in second.tactile[:changes]:
+        tactile.holding += 1
+    return first, second
+
+
+def _diff_benchmark(changes, epsilon=0.0):
+    first, second = _reports(changes)
+    differ = ReportDiffer(epsilon)
+    differ.diff(first)
+
+    def run():
+        differ.diff(second)
+        differ.diff(first)
+
+    return run
+
+
+@benchmark('report_diff.unchanged_{}'.format(TACTILES))
+def diff_unchanged():
+    return _diff_benchmark(0)
+
+
+@benchmark('report_diff.changed_5_of_{}'.format(TACTILES))
+def diff_changed_5():
+    return _diff_benchmark(5)
+
+
+@benchmark('report_diff.changed_all_{}'.format(TACTILES))
+def diff_changed_all():
+    return _diff_benchmark(TACTILES)
+
+
+@benchmark('report_diff.naive_{}'.format(TACTILES))
+def diff_naive():
+    """What a handler comparing every tactile against the last report by hand does."""
+    first, second = _reports(5)
+    last = {}
+
+    def compare(report):
+        changed = []
+        for tactile in report.tactile:
+            previous = last.get(tactile.id)
+            if previous is None or previous.holding != tactile.holding \
+                    or previous.pressFrequency != tactile.pressFrequency \
+                    or previous.releaseFrequency != tactile.releaseFrequency:
+                changed.append(tactile.id)
+            last[tactile.id] = tactile
+        return changed
+
+    compare(first)
+
+    def run():
+        compare(second)
+        compare(first)
+
+    return run
@@ -0,0 +1,67 @@
+from beam_interactive_unofficial.beam_interactive_modified import proto
+from beam_interactive_unofficial.progress_update import ProgressUpdate, ScreenUpdate
+
+from .fixtures import make_report
+from .runner import benchmark
+
+try:
+    import numpy as np
+    from beam_interactive_unofficial.screen import ScreenHeatmap
+except ImportError:  # NumPy isn't installed
+    ScreenHeatmap = None
+
+SCREENS = 5
+CLICKS = 50
+
+
+def _rows():
+    return [(0.02 * c, 0.5, 1 - 0.01 * c) for c in range(CLICKS)]
+
+
+@benchmark('screen.clicks.dicts_{}x{}'.format(SCREENS, CLICKS))
+def clicks_dicts():
+    """Building and encoding screen updates from per-click dicts, checked on the way."""
+    rows = _rows()
+
+    def run():
+        update = ProgressUpdate()
+        for i in range(SCREENS):
+            update.screen_updates.append(ScreenUpdate(id_=i, clicks=[
+                {'intensity': intensity, 'coordinate': {'x': x, 'y': y}} for x, y, intensity in rows]))
+        proto.encode(update.to_probuf())
+
+    return run
+
+
+if ScreenHeatmap is not None:
+    @benchmark('screen.clicks.array_{}x{}'.format(SCREENS, CLICKS))
+    def clicks_array():
+        """The same clicks as (N, 3) arrays."""
+        clicks = np.array(_rows())
+
+        def run():
+            update = ProgressUpdate()
+            for i in range(SCREENS):
+                update.screen_updates.append(ScreenUpdate(id_=i, clicks=clicks))
+            proto.encode(update.to_probuf())
+
+        return run
+
+    @benchmark('screen.heatmap.update_20_screens')
+    def heatmap_update():
+        report = make_report(tactiles=0, joysticks=0, screens=20)
+        heatmap = ScreenHeatmap()
+        now = [0.0]
+
+        def run():
+            now[0] += 0.1
+            heatmap.update(report, now[0])
+
+        return run
+
+    @benchmark('screen.heatmap.progress_20_screens')
+    def heatmap_progress():
+        report = make_report(tactiles=0, joysticks=0, screens=20)
+        heatmap = ScreenHeatmap()
+        heatmap.update(report, 0.0)
+        return lambda: heatmap.progress(count=10)
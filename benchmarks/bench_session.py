@@ -0,0 +1,119 @@
+import asyncio
+import threading
+
+from beam_interactive_unofficial.beam_interactive_modified import start, proto
+from beam_interactive_unofficial.interactive_client import BeamInteractiveClient
+from beam_interactive_unofficial.mock_robot import MockRobotServer, MockBeamAPI
+
+from .runner import benchmark
+
+
+def _session_benchmark(**robot_options):
+    loop = asyncio.new_event_loop()
+    robot = MockRobotServer(channel=1, key='key', loop=loop, **robot_options)
+    loop.run_until_complete(robot.start())
+
+    @asyncio.coroutine
+    def session():
+        connection = yield from start(robot.address, 1, 'key', loop)
+        yield from connection.wait_message()
+        decoded, _ = connection.get_packet()
+        assert isinstance(decoded, proto.HandshakeACK)
+        connection.close()
+
+    def teardown():
+        robot.close()
+        loop.run_until_complete(robot.wait_closed())
+        loop.close()
+
+    return lambda: loop.run_until_complete(session()), teardown
+
+
+@benchmark('session.handshake')
+def handshake():
+    return _session_benchmark(report_rate=0)
+
+
+def _connect_benchmark(fast_start):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    robot = MockRobotServer(channel=1, key='key', loop=loop, report_rate=0)
+    loop.run_until_complete(robot.start())
+    # A few milliseconds per request, so the overlap shows up next to the socket setup
+    api = MockBeamAPI(robot.address, channel=1, key='key', delay=0.005).start()
+    client = BeamInteractiveClient('token', 10, api_url=api.url, fast_start=fast_start,
+                                   robot=(1, robot.address, 'key'))
+    client.loop = loop
+
+    @asyncio.coroutine
+    def session():
+        yield from client._connect()
+        yield from client.connection.wait_message()
+        decoded, _ = client.connection.get_packet()
+        assert isinstance(decoded, proto.HandshakeACK)
+        client.watchdog.stop()
+        client.connection.close()
+        yield from client.connection.wait_closed()
+
+    def teardown():
+        api.close()
+        robot.close()
+        loop.run_until_complete(robot.wait_closed())
+        loop.close()
+
+    return lambda: loop.run_until_complete(session()), teardown
+
+
+@benchmark('session.connect.sequential')
+def connect_sequential():
+    return _connect_benchmark(fast_start=False)
+
+
+@benchmark('session.connect.fast_start')
+def connect_fast_start():
+    return _connect_benchmark(fast_start=True)
+
+
+@benchmark('session.start.stream_reports')
+def start_stream_reports():
+    """
+    A whole start() session in which on_connect hands a reports() stream
+    to another task. start() is already reading, so the stream has to be
+    fed by it rather than read the connection a second time.
+    """
+    robot_loop = asyncio.new_event_loop()
+    robot = MockRobotServer(channel=1, key='key', loop=robot_loop, report_rate=1000)
+    robot_loop.run_until_complete(robot.start())
+    thread = threading.Thread(target=robot_loop.run_forever, daemon=True)
+    thread.start()
+    api = MockBeamAPI(robot.address, channel=1, key='key').start()
+
+    def session():
+        received = []
+
+        @asyncio.coroutine
+        def consume(reports):
+            while len(received) < 5:
+                received.append((yield from reports.__anext__()))
+            reports.close()
+            client.connection.close()
+
+        def on_connect(ack):
+            client.loop.create_task(consume(client.reports()))
+
+        client = BeamInteractiveClient('token', 10, api_url=api.url, on_connect=on_connect)
+        try:
+            client.start()
+        except asyncio.CancelledError:
+            pass  # newer Pythons report start() cancelling its leftover tasks this way
+        assert len(received) == 5, received
+
+    def teardown():
+        api.close()
+        robot_loop.call_soon_threadsafe(robot.close)
+        asyncio.run_coroutine_threadsafe(robot.wait_closed(), robot_loop).result()
+        robot_loop.call_soon_threadsafe(robot_loop.stop)
+        thread.join()
+        robot_loop.close()
+
+    return session, teardown
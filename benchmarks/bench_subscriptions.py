@@ -0,0 +1,48 @@
+import asyncio
+
+from .bench_client import LoopbackSocket, make_client, close_client
+from .fixtures import make_report
+from .runner import benchmark
+
+GAME_MODULES = 24
+
+
+def _client(loop):
+    client = make_client(loop, LoopbackSocket(loop))
+    return client, make_report(tactiles=500, joysticks=10, screens=5)
+
+
+@benchmark('subscriptions.on_tactile_{}_modules'.format(GAME_MODULES))
+def on_tactile():
+    """GAME_MODULES game modules each watching one tactile through the subscription index."""
+    loop = asyncio.new_event_loop()
+    client, report = _client(loop)
+    for i in range(GAME_MODULES):
+        client.on_tactile(i * 20, lambda info: None)
+
+    return lambda: loop.run_until_complete(client._dispatch_controls(report)), lambda: close_client(loop, client)
+
+
+@benchmark('subscriptions.scan_{}_modules'.format(GAME_MODULES))
+def scan():
+    """The same modules as on_report handlers, each scanning the report for its tactile."""
+    loop = asyncio.new_event_loop()
+    client, report = _client(loop)
+
+    def module(tactile_id):
+        @asyncio.coroutine
+        def handler(report):
+            for tactile in report.tactile:
+                if tactile.id == tactile_id:
+                    return tactile
+
+        return handler
+
+    handlers = [module(i * 20) for i in range(GAME_MODULES)]
+
+    @asyncio.coroutine
+    def dispatch():
+        for handler in handlers:
+            yield from handler(report)
+
+    return lambda: loop.run_until_complete(dispatch()), lambda: close_client(loop, client)
@@ -0,0 +1,63 @@
+import asyncio
+
+from .bench_client import LoopbackSocket, make_client, close_client
+from .runner import benchmark
+
+BUTTONS = 500
+
+
+def _tactile_benchmark(call):
+    """Times one call against a client with BUTTONS buttons, until its frames reach the socket."""
+    loop = asyncio.new_event_loop()
+    socket = LoopbackSocket(loop)
+    client = make_client(loop, socket)
+    client._num_buttons = BUTTONS
+
+    def run():
+        sent = socket.sent_count
+        call(client)
+        while socket.sent_count == sent or client.connection._write_queue_depth.value:
+            loop.run_until_complete(asyncio.sleep(0, loop=loop))
+
+    return run, lambda: close_client(loop, client)
+
+
+def _fire_uncached(client):
+    # what tactile_fire() used to do: build and send both updates from scratch
+    update_on, update_off = client._fire_updates(range(client._num_buttons))
+    client.send(update_on)
+    client.send(update_off)
+
+
+@benchmark('tactile.fire_all_{}'.format(BUTTONS))
+def fire_all():
+    return _tactile_benchmark(lambda client: client.tactile_fire())
+
+
+@benchmark('tactile.fire_all_{}_uncached'.format(BUTTONS))
+def fire_all_uncached():
+    return _tactile_benchmark(_fire_uncached)
+
+
+@benchmark('tactile.fire_one')
+def fire_one():
+    return _tactile_benchmark(lambda client: client.tactile_fire(7))
+
+
+@benchmark('tactile.cooldown_all_{}'.format(BUTTONS))
+def cooldown_all():
+    return _tactile_benchmark(lambda client: client.tactile_cooldown(1000))
+
+
+@benchmark('tactile.cooldown_all_{}_tracked_redundant'.format(BUTTONS))
+def cooldown_all_tracked_redundant():
+    """A repeated cooldown that the tracker drops, against cooldown_all's full send."""
+    loop = asyncio.new_event_loop()
+    socket = LoopbackSocket(loop)
+    client = make_client(loop, socket)
+    client._num_buttons = BUTTONS
+    client._track_cooldowns = True
+    client._start_cooldowns()
+    client.tactile_cooldown(3600 * 1000)
+
+    return lambda: client.tactile_cooldown(1000), lambda: close_client(loop, client)
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+from .bench_client import LoopbackSocket, make_client, close_client
+from .runner import benchmark
+
+MESSAGES = 1000
+
+
+def _threaded_send_benchmark(producers):
+    """
+    Runs the client's loop on a background thread and times `producers`
+    threads sharing MESSAGES sends between them, until the last one has
+    reached the socket.
+    """
+    loop = asyncio.new_event_loop()
+    socket = LoopbackSocket(loop)
+    client = make_client(loop, socket)
+    loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+    loop_thread.start()
+
+    update = client._to_probuf({'state': 'PLAYING'})
+    done = threading.Event()
+    per_thread = MESSAGES // producers
+
+    def produce():
+        for _ in range(per_thread):
+            client.connection.send(update)
+
+    def run():
+        target = socket.sent_count + per_thread * producers
+        threads = [threading.Thread(target=produce) for _ in range(producers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        while socket.sent_count < target:
+            done.wait(0.0001)
+
+    def teardown():
+        loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join()
+        close_client(loop, client)
+
+    return run, teardown
+
+
+@benchmark('threads.send_x{}.1_producer'.format(MESSAGES))
+def one_producer():
+    return _threaded_send_benchmark(1)
+
+
+@benchmark('threads.send_x{}.4_producers'.format(MESSAGES))
+def four_producers():
+    return _threaded_send_benchmark(4)
+
+
+@benchmark('threads.send_x{}.8_producers'.format(MESSAGES))
+def eight_producers():
+    return _threaded_send_benchmark(8)
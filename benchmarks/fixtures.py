@@ -0,0 +1,64 @@
+"""
+Sample packets shared between the benchmarks. These are sized to look
+roughly like a busy channel rather than a toy example.
+"""
+
+from beam_interactive_unofficial.beam_interactive_modified import proto
+from beam_interactive_unofficial.progress_update import ProgressUpdate, TactileUpdate, JoystickUpdate, ScreenUpdate
+
+
+def make_report(tactiles=50, joysticks=2, screens=1, users=200, qgram=10):
+    report = proto.Report()
+    report.time = 1000
+    report.users.connected = users
+    report.users.quorum = users // 2
+    report.users.active = users // 4
+    for i in range(qgram):
+        bucket = report.users.qgram.add()
+        bucket.x = i
+        bucket.y = users // (i + 1)
+
+    for i in range(tactiles):
+        tactile = report.tactile.add()
+        tactile.id = i
+        tactile.holding = i % 3
+        tactile.pressFrequency = i % 5
+        tactile.releaseFrequency = i % 4
+
+    for i in range(joysticks):
+        joystick = report.joystick.add()
+        joystick.id = i
+        joystick.coordMean.x, joystick.coordMean.y = 0.25, -0.5
+        joystick.coordStddev.x, joystick.coordStddev.y = 0.1, 0.1
+
+    for i in range(screens):
+        screen = report.screen.add()
+        screen.id = i
+        screen.clicks = 12
+        screen.coordMean.x, screen.coordMean.y = 0.5, 0.5
+        screen.coordStddev.x, screen.coordStddev.y = 0.2, 0.2
+
+    return report
+
+
+def make_update_dict(tactiles=20, joysticks=2, screens=1, clicks=5):
+    return {
+        'state': 'PLAYING',
+        'tactile': [{'id': i, 'cooldown': 1000, 'progress': 0.5, 'disabled': False} for i in range(tactiles)],
+        'joystick': [{'id': i, 'angle': 1.5, 'intensity': 0.75} for i in range(joysticks)],
+        'screen': [{'id': i, 'clicks': [{'intensity': 0.5, 'coordinate': {'x': 0.1 * c, 'y': 0.2}}
+                                        for c in range(clicks)]} for i in range(screens)],
+    }
+
+
+def make_update(tactiles=20, joysticks=2, screens=1, clicks=5):
+    update = ProgressUpdate()
+    update.state = 'PLAYING'
+    for i in range(tactiles):
+        update.tactile_updates.append(TactileUpdate(id_=i, cooldown=1000, progress=0.5, disabled=False))
+    for i in range(joysticks):
+        update.joystick_updates.append(JoystickUpdate(id_=i, angle=1.5, intensity=0.75))
+    for i in range(screens):
+        update.screen_updates.append(ScreenUpdate(id_=i, clicks=[
+            {'intensity': 0.5, 'coordinate': {'x': 0.1 * c, 'y': 0.2}} for c in range(clicks)]))
+    return update
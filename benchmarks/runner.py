@@ -0,0 +1,149 @@
+import gc
+import json
+import platform
+import sys
+import time
+from collections import OrderedDict
+
+_benchmarks = OrderedDict()
+
+
+def benchmark(name, group=None):
+    """
+    Registers a benchmark under the given name. The decorated function
+    does any setup it needs and returns a zero-argument callable, which
+    is the thing that actually gets timed. It may instead return a
+    (callable, teardown) pair if something needs cleaning up afterwards.
+    """
+
+    def register(f):
+        _benchmarks[name] = {'name': name, 'group': group or name.split('.')[0], 'setup': f}
+        return f
+
+    return register
+
+
+def registered(pattern=None):
+    """
+    Returns the registered benchmarks, optionally only those whose name
+    contains the given pattern.
+    """
+    return [b for b in _benchmarks.values() if pattern is None or pattern in b['name']]
+
+
+def _autorange(func, min_time):
+    """
+    Works out how many loops of func are needed to fill min_time, so that
+    timer resolution doesn't swamp very fast benchmarks.
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return loops
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+
+def run_one(bench, repeat=5, min_time=0.1):
+    """
+    Runs a single benchmark and returns its timings in nanoseconds
+    per call.
+    """
+    func, teardown = bench['setup'](), None
+    if isinstance(func, tuple):
+        func, teardown = func
+    loops = _autorange(func, min_time)
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(loops):
+                func()
+            samples.append((time.perf_counter() - start) / loops * 1e9)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        if teardown is not None:
+            teardown()
+
+    samples.sort()
+    return {
+        'group': bench['group'],
+        'loops': loops,
+        'repeat': repeat,
+        'min_ns': samples[0],
+        'median_ns': samples[len(samples) // 2],
+        'mean_ns': sum(samples) / len(samples),
+        'max_ns': samples[-1],
+    }
+
+
+def _protobuf_backend():
+    # Codec timings are only comparable between runs on the same backend
+    from beam_interactive_unofficial.beam_interactive_modified import proto
+    try:
+        return proto.backend()
+    except ImportError:
+        return None
+
+
+def run(pattern=None, repeat=5, min_time=0.1, out=sys.stdout):
+    """
+    Runs every registered benchmark (matching pattern, if given) and
+    returns a results dict that can be dumped straight to JSON.
+    """
+    results = OrderedDict()
+    for bench in registered(pattern):
+        results[bench['name']] = result = run_one(bench, repeat=repeat, min_time=min_time)
+        if out is not None:
+            print("{:<48} {:>14.1f} ns  (min {:.1f}, {} loops)".format(
+                bench['name'], result['median_ns'], result['min_ns'], result['loops']), file=out)
+
+    return {
+        'meta': {
+            'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'protobuf': _protobuf_backend(),
+            'time': time.time(),
+        },
+        'results': results,
+    }
+
+
+def save(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline, current, threshold=0.1, key='median_ns'):
+    """
+    Compares two result sets. Returns a list of (name, old, new, change)
+    tuples for every benchmark present in both, where change is the
+    relative slowdown (0.25 == 25% slower), along with the names that
+    regressed by more than threshold.
+    """
+    rows, regressions = [], []
+    old_results, new_results = baseline['results'], current['results']
+
+    for name, new in new_results.items():
+        if name not in old_results:
+            continue
+        old_value, new_value = old_results[name][key], new[key]
+        change = (new_value - old_value) / old_value if old_value else 0.0
+        rows.append((name, old_value, new_value, change))
+        if change > threshold:
+            regressions.append(name)
+
+    return rows, regressions